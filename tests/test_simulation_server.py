@@ -0,0 +1,119 @@
+"""End-to-end tests of the simulation server and client over HTTP."""
+
+import base64
+import http.client
+import json
+import threading
+
+import pytest
+
+from volcogui.backend import simulation_server
+from volcogui.backend.simulation_client import RemoteSimulationError, SimulationClient
+from volcogui.backend.simulation_server import SimulationServer
+
+
+GCODE = b"""G21
+G90
+M82
+G92 E0
+G1 Z0.2 F3000
+G1 X5 Y0 E0.2 F1200
+G1 X5 Y5 E0.4
+; caf\xe9 (Latin-1 comment)
+"""
+
+
+@pytest.fixture
+def server(tmp_path):
+    server = SimulationServer(port=0, work_dir=str(tmp_path / "server"))
+    server.start()
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture
+def client(server):
+    return SimulationClient(server.address)
+
+
+@pytest.fixture
+def gcode_path(tmp_path):
+    path = tmp_path / "part.gcode"
+    path.write_bytes(GCODE)
+    return path
+
+
+PARAMS = {'voxel_size': 0.2, 'step_size': 0.2, 'nozzle_diameter': 0.4}
+
+
+def test_submit_stream_and_fetch(server, client, gcode_path, tmp_path):
+    job_id = client.submit(str(gcode_path), PARAMS)
+    # The G-code is stored byte for byte
+    assert server.get(job_id).gcode_path.read_bytes() == GCODE
+
+    events = list(client.stream_events(job_id))
+    assert events[-1]['type'] == 'finished', events
+    assert client.status(job_id)['state'] == 'finished'
+
+    result = tmp_path / "result.stl"
+    client.fetch_result(job_id, str(result))
+    assert result.stat().st_size > 0
+
+
+def test_cancel_queued_job(server, client, gcode_path):
+    # Hold the only slot so the job stays queued
+    server.slots.acquire()
+    try:
+        job_id = client.submit(str(gcode_path), PARAMS)
+        client.cancel(job_id)
+        events = list(client.stream_events(job_id))
+    finally:
+        server.slots.release()
+    assert events[-1]['type'] == 'cancelled'
+    assert client.status(job_id)['state'] == 'cancelled'
+    with pytest.raises(RemoteSimulationError):
+        client.fetch_result(job_id, str(gcode_path.with_suffix('.stl')))
+
+
+def test_delete_removes_job_and_files(server, client, gcode_path):
+    job_id = client.submit(str(gcode_path), PARAMS)
+    job_dir = server.get(job_id).job_dir
+    client.delete(job_id)
+    assert server.get(job_id) is None
+    assert not job_dir.exists()
+    with pytest.raises(RemoteSimulationError, match="Unknown job"):
+        client.status(job_id)
+
+
+@pytest.mark.parametrize('name', ['..', '../escape.gcode', 'dir/part.gcode', 'dir\\part.gcode'])
+def test_rejects_unsafe_job_names(server, name):
+    payload = {'name': name, 'gcode_base64': base64.b64encode(GCODE).decode('ascii'),
+               'params': PARAMS}
+    host, port = server.httpd.server_address[:2]
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    try:
+        conn.request('POST', '/jobs', json.dumps(payload).encode('utf-8'),
+                     {'Content-Type': 'application/json'})
+        response = conn.getresponse()
+        reply = json.loads(response.read())
+    finally:
+        conn.close()
+    assert response.status == 400
+    assert "Invalid G-code file name" in reply['error']
+    assert not server.jobs
+    assert not (server.work_dir.parent / 'escape.gcode').exists()
+
+
+def test_process_start_failure_ends_job(server, client, gcode_path, monkeypatch):
+    def fail(*args):
+        raise OSError("no more processes")
+
+    monkeypatch.setattr(simulation_server, 'start_simulation_process', fail)
+    job_id = client.submit(str(gcode_path), PARAMS)
+    events = []
+    # Guard against a stream that never ends
+    reader = threading.Thread(target=lambda: events.extend(client.stream_events(job_id)), daemon=True)
+    reader.start()
+    reader.join(timeout=30)
+    assert events and events[-1]['type'] == 'error'
+    assert "no more processes" in events[-1]['message']
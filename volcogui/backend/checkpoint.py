@@ -0,0 +1,214 @@
+"""Checkpoint and resume of Volco's deposition loop.
+
+Volco deposits filaments one at a time in VoxelSpace._deposit_filament.
+While a simulation runs, that method is wrapped so that every few
+minutes the voxel space and the index of the last completed filament are
+saved together in one file, which replaces the previous checkpoint in a
+single rename. Normally a copy of the voxel space is compressed and
+written on a background thread, so deposition carries on meanwhile; when
+a memory budget has no room for that copy, the live voxel space is
+written while deposition waits. A resumed run restores the voxel space
+and skips the filaments that were already deposited.
+
+The same hook reports the size of the voxel array once Volco has
+allocated it, for the resource display.
+
+Checkpoints are keyed by a hash of the G-code and the parameters that
+affect deposition, so a checkpoint is only used for an identical job.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+
+# Parameters that change what is deposited; everything else (output
+# name, post-processing, remote engine, ...) does not invalidate a checkpoint
+KEY_PARAMETERS = (
+    'voxel_size', 'step_size', 'nozzle_diameter', 'region',
+    'simplify_gcode', 'simplify_tolerance',
+    'consider_acceleration', 'nozzle_jerk_speed', 'nozzle_acceleration',
+    'extruder_jerk_speed', 'extruder_acceleration',
+)
+
+DEFAULT_INTERVAL = 120.0  # Seconds between checkpoints
+
+VOXELS_FILE = 'voxels.npz'
+
+
+def default_checkpoint_root() -> Path:
+    return Path(tempfile.gettempdir()) / "volcogui_checkpoints"
+
+
+def checkpoint_key(gcode_path: str, params: dict) -> str:
+    """Hash of the G-code contents and the deposition parameters."""
+    digest = hashlib.sha256(Path(gcode_path).read_bytes())
+    relevant = {name: params.get(name) for name in KEY_PARAMETERS}
+    digest.update(json.dumps(relevant, sort_keys=True).encode())
+    return digest.hexdigest()[:32]
+
+
+def checkpoint_dir(root: str, key: str) -> Path:
+    return Path(root) / key
+
+
+def find_checkpoint(root: str, gcode_path: str, params: dict) -> Optional[dict]:
+    """State of a resumable checkpoint for this G-code and parameters, or None.
+
+    The state has 'filament' (last deposited) and 'time'.
+    """
+    path = checkpoint_dir(root, checkpoint_key(gcode_path, params)) / VOXELS_FILE
+    if not path.exists():
+        return None
+    try:
+        # Only the small members are decompressed, not the voxels
+        with np.load(path) as data:
+            return {'filament': int(data['filament']), 'time': float(data['time'])}
+    except (OSError, ValueError, KeyError):
+        # Unreadable, or written before the state was stored with the voxels
+        return None
+
+
+def discard_checkpoint(root: str, gcode_path: str, params: dict):
+    shutil.rmtree(checkpoint_dir(root, checkpoint_key(gcode_path, params)), ignore_errors=True)
+
+
+def load_checkpoint(directory: Path):
+    """Return (voxels, filament) from a checkpoint directory."""
+    with np.load(directory / VOXELS_FILE) as data:
+        return data['voxels'], int(data['filament'])
+
+
+class CheckpointWriter:
+    """Writes voxel-space snapshots on a background thread.
+
+    A snapshot is skipped, not queued, while the previous one is still
+    being written, so the deposition loop never waits for disk I/O.
+    With copy=False there is no snapshot: the live array is written
+    synchronously, saving a voxel space's worth of memory.
+    """
+
+    def __init__(self, directory: Path, interval: float, copy: bool = True):
+        self.directory = Path(directory)
+        self.interval = interval
+        self.copy = copy
+        self.last_write = time.monotonic()
+        self._thread = None
+
+    def maybe_write(self, voxels: np.ndarray, filament: int):
+        """Snapshot the voxel space if the interval has passed and no write is pending."""
+        if time.monotonic() - self.last_write < self.interval:
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        if not self.copy:
+            self._write(voxels, filament)
+            self.last_write = time.monotonic()
+            return
+        self.last_write = time.monotonic()
+        # Copy now: deposition keeps modifying the live array
+        snapshot = voxels.copy()
+        self._thread = threading.Thread(target=self._write, args=(snapshot, filament), daemon=True)
+        self._thread.start()
+
+    def _write(self, voxels: np.ndarray, filament: int):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Voxels and filament index go in one file that is renamed into place,
+        # so a kill at any point leaves a consistent checkpoint. The temporary
+        # name is unique: identical jobs running at once share the directory
+        fd, voxels_tmp = tempfile.mkstemp(prefix=VOXELS_FILE + '.', suffix='.tmp', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez_compressed(f, voxels=voxels, filament=np.int64(filament),
+                                    time=np.float64(time.time()))
+            os.replace(voxels_tmp, self.directory / VOXELS_FILE)
+        except BaseException:
+            os.unlink(voxels_tmp)
+            raise
+
+    def close(self):
+        """Wait for a pending write."""
+        if self._thread is not None:
+            self._thread.join()
+
+
+def _voxel_array(voxel_space) -> np.ndarray:
+    """The voxel grid of a Volco VoxelSpace (its largest 3D array attribute)."""
+    arrays = [value for value in vars(voxel_space).values()
+              if isinstance(value, np.ndarray) and value.ndim == 3]
+    if not arrays:
+        raise AttributeError("VoxelSpace has no 3D voxel array")
+    return max(arrays, key=lambda array: array.size)
+
+
+@contextmanager
+def deposition_checkpoints(directory: Optional[Path], resume: bool, interval: float, status_callback,
+                           copy: bool = True, voxels_callback=None):
+    """Checkpoint (and optionally resume) Volco deposition inside the with-block.
+
+    Volco must be importable. If its VoxelSpace cannot be hooked the block
+    runs without checkpoints. copy=False writes without a snapshot copy
+    (see CheckpointWriter). With directory None nothing is checkpointed.
+    voxels_callback, if given, receives the voxel array's size in bytes
+    before the first filament is deposited.
+    """
+    try:
+        from app.geometry.voxel_space import VoxelSpace
+        # A terminated worker thread never unpatches, so keep hold of the real method
+        original = getattr(VoxelSpace, '_volcogui_deposit_filament', None) or VoxelSpace._deposit_filament
+        VoxelSpace._volcogui_deposit_filament = original
+    except (ImportError, AttributeError):
+        if directory is not None:
+            status_callback("Checkpointing not supported by this Volco version")
+        yield
+        return
+
+    restore = None
+    if directory is not None and resume and (directory / VOXELS_FILE).exists():
+        try:
+            restore = load_checkpoint(directory)
+            status_callback(f"Resuming from filament {restore[1]}...")
+        except (OSError, ValueError, KeyError):
+            status_callback("Checkpoint is unreadable - starting over")
+    writer = CheckpointWriter(directory, interval, copy) if directory is not None else None
+    deposited = 0
+
+    def deposit_filament(self, *args, **kwargs):
+        nonlocal deposited, restore
+        deposited += 1
+        if deposited == 1 and voxels_callback is not None:
+            voxels_callback(_voxel_array(self).nbytes)
+        if restore is not None:
+            voxels, filament = restore
+            if deposited == 1:
+                target = _voxel_array(self)
+                if target.shape != voxels.shape:
+                    status_callback("Checkpoint does not match the voxel space - starting over")
+                    restore = None
+                else:
+                    target[...] = voxels
+            if restore is not None and deposited <= filament:
+                # Already in the restored voxel space
+                return None
+            restore = None
+        result = original(self, *args, **kwargs)
+        if writer is not None:
+            writer.maybe_write(_voxel_array(self), deposited)
+        return result
+
+    VoxelSpace._deposit_filament = deposit_filament
+    try:
+        yield
+    finally:
+        VoxelSpace._deposit_filament = original
+        if writer is not None:
+            writer.close()
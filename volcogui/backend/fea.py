@@ -0,0 +1,685 @@
+"""Linear-elastic FEA on the retained voxel grid.
+
+Every occupied voxel becomes an 8-node hexahedron. The global stiffness
+matrix is assembled once per geometry and kept in memory, together with
+the reduced system and preconditioner for each pair of constrained faces,
+so further load cases only pay for the conjugate-gradient solve. The
+system is solved iteratively (PCG with algebraic multigrid when pyamg is
+installed, Jacobi otherwise) because a direct factorisation runs out of
+memory at realistic voxel counts.
+
+Units are mm, MPa and N.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import scipy.sparse as sp
+from scipy import ndimage
+
+try:
+    import pyamg
+    PYAMG_AVAILABLE = True
+except ImportError:
+    PYAMG_AVAILABLE = False
+
+from volcogui.backend.voxel_io import load_voxel_grid, OCCUPANCY_THRESHOLD
+
+
+DEFAULT_LOAD_CASE = {
+    # Material and load defaults follow Volco's FEA module (PLA, 1% compression)
+    'youngs_modulus': 2000.0,   # MPa
+    'poisson_ratio': 0.3,
+    'fixed_face': 'z-',         # Face clamped in all directions
+    'loaded_face': 'z+',        # Face displaced along its normal
+    'strain': -0.01,            # Applied displacement / part length (negative = compression)
+    'coarsening_levels': 2,     # Octree levels merged in the interior, 0 = one element per voxel
+    'fine_layers': 1,           # Voxel layers below the surface kept at full resolution
+    'homogeneity': 0.05,        # Max voxel value spread inside a merged block
+    'preconditioner': 'auto',   # 'auto', 'amg' or 'jacobi'
+    'tolerance': 1e-6,          # Relative residual
+    'max_iterations': 5000,
+}
+
+FACES = ('x-', 'x+', 'y-', 'y+', 'z-', 'z+')
+
+FEA_SUFFIX = '.fea.vtp'
+
+# Corner offsets in VTK hexahedron order
+_NODE_OFFSETS = np.array([
+    [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+    [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1],
+])
+
+# Elements assembled per batch, bounding the size of the COO triplets
+_ASSEMBLY_BATCH = 16384
+
+# Assembled geometries kept in memory
+_MAX_CACHED_MODELS = 2
+_models = OrderedDict()
+
+
+def fea_result_path(stl_path: str) -> Path:
+    """Path of the FEA surface that belongs to an STL file."""
+    path = Path(stl_path)
+    return path.with_name(path.stem + FEA_SUFFIX)
+
+
+def elasticity_matrix(youngs_modulus: float, poisson_ratio: float) -> np.ndarray:
+    """Isotropic 6x6 constitutive matrix (xx, yy, zz, xy, yz, zx; engineering shear)."""
+    nu = poisson_ratio
+    scale = youngs_modulus / ((1 + nu) * (1 - 2 * nu))
+    D = np.zeros((6, 6))
+    D[:3, :3] = nu
+    np.fill_diagonal(D[:3, :3], 1 - nu)
+    D[3:, 3:] = np.eye(3) * (1 - 2 * nu) / 2
+    return D * scale
+
+
+def strain_displacement(point) -> np.ndarray:
+    """6x24 B matrix of a unit cube at a point in [0, 1]^3."""
+    point = np.asarray(point, dtype=float)
+    # Shape function factors per corner and axis: x or (1 - x)
+    factors = np.where(_NODE_OFFSETS == 1, point, 1 - point)
+    signs = np.where(_NODE_OFFSETS == 1, 1.0, -1.0)
+    gradients = np.empty((8, 3))
+    for axis in range(3):
+        others = [a for a in range(3) if a != axis]
+        gradients[:, axis] = signs[:, axis] * factors[:, others].prod(axis=1)
+
+    B = np.zeros((6, 24))
+    dx, dy, dz = gradients.T
+    B[0, 0::3] = dx
+    B[1, 1::3] = dy
+    B[2, 2::3] = dz
+    B[3, 0::3], B[3, 1::3] = dy, dx
+    B[4, 1::3], B[4, 2::3] = dz, dy
+    B[5, 0::3], B[5, 2::3] = dz, dx
+    return B
+
+
+def unit_hex_stiffness(poisson_ratio: float) -> np.ndarray:
+    """24x24 stiffness of a unit cube with E = 1 (2x2x2 Gauss quadrature).
+
+    A cube of side h has h times this stiffness, and every entry is
+    proportional to E.
+    """
+    D = elasticity_matrix(1.0, poisson_ratio)
+    gauss = 0.5 + np.array([-0.5, 0.5]) / np.sqrt(3)
+    Ke = np.zeros((24, 24))
+    for x in gauss:
+        for y in gauss:
+            for z in gauss:
+                B = strain_displacement((x, y, z))
+                Ke += B.T @ D @ B / 8
+    return Ke
+
+
+def largest_component(mask: np.ndarray) -> np.ndarray:
+    """Keep only the largest face-connected part of a voxel mask."""
+    labels, count = ndimage.label(mask)
+    if count <= 1:
+        return mask
+    sizes = np.bincount(labels.ravel())
+    sizes[0] = 0
+    return labels == sizes.argmax()
+
+
+def shape_functions(points: np.ndarray) -> np.ndarray:
+    """(p, 8) trilinear shape function values at points in [0, 1]^3."""
+    points = np.asarray(points, dtype=float)[:, None, :]
+    return np.where(_NODE_OFFSETS == 1, points, 1 - points).prod(axis=2)
+
+
+def _block_reduce(array: np.ndarray, reduce) -> np.ndarray:
+    """Reduce every aligned 2x2x2 block of an array."""
+    nx, ny, nz = array.shape
+    return reduce(array.reshape(nx // 2, 2, ny // 2, 2, nz // 2, 2), axis=(1, 3, 5))
+
+
+def _upsample(array: np.ndarray) -> np.ndarray:
+    return array.repeat(2, axis=0).repeat(2, axis=1).repeat(2, axis=2)
+
+
+def octree_blocks(grid: np.ndarray, mask: np.ndarray, levels: int = 0,
+                  fine_layers: int = 1, homogeneity: float = 0.05):
+    """Split a voxel mask into octree blocks.
+
+    An aligned block of 2^k voxels (k <= levels) becomes one element when
+    all of its voxels lie at least fine_layers voxels below the surface
+    and their values spread by at most homogeneity, so surfaces and
+    partially filled voxels (e.g. between filaments) keep full resolution.
+    Returns (origins, sizes) of the blocks in voxel units.
+    """
+    block = 2 ** levels
+    padding = [(0, -n % block) for n in mask.shape]
+    eligible = mask
+    if levels and fine_layers:
+        eligible = ndimage.binary_erosion(mask, iterations=fine_layers)
+    eligible = np.pad(eligible, padding)
+    high = low = np.pad(np.asarray(grid, dtype=np.float32), padding)
+
+    merged = [eligible]
+    for _ in range(levels):
+        high = _block_reduce(high, np.max)
+        low = _block_reduce(low, np.min)
+        merged.append(_block_reduce(merged[-1], np.all) & (high - low <= homogeneity))
+
+    origins, sizes = [], []
+    taken = np.zeros(merged[-1].shape, dtype=bool)
+    for level in range(levels, 0, -1):
+        new = merged[level] & ~taken
+        origins.append(np.argwhere(new) * 2 ** level)
+        sizes.append(np.full(len(origins[-1]), 2 ** level))
+        taken = _upsample(taken | new)
+    fine = np.pad(mask, padding) & ~taken
+    origins.append(np.argwhere(fine))
+    sizes.append(np.ones(len(origins[-1]), dtype=int))
+    return np.concatenate(origins), np.concatenate(sizes)
+
+
+def hex_mesh(origins: np.ndarray, sizes: np.ndarray, lattice_shape):
+    """Hexahedra for octree blocks.
+
+    Returns (nodes, elements, node_ids): integer lattice coordinates of the
+    used nodes, (m, 8) node indices per element and the sorted flat
+    lattice index of every node.
+    """
+    lattice_shape = np.asarray(lattice_shape)
+    corners = origins[:, None, :] + sizes[:, None, None] * _NODE_OFFSETS[None, :, :]
+    corner_ids = np.ravel_multi_index(corners.reshape(-1, 3).T, lattice_shape)
+    node_ids, elements = np.unique(corner_ids, return_inverse=True)
+    nodes = np.column_stack(np.unravel_index(node_ids, lattice_shape))
+    return nodes, elements.reshape(-1, 8).astype(np.int32), node_ids
+
+
+def hanging_node_interpolation(node_ids: np.ndarray, elements: np.ndarray, origins: np.ndarray,
+                               sizes: np.ndarray, lattice_shape):
+    """Constrain nodes that hang on the faces and edges of larger elements.
+
+    A hanging node follows the trilinear interpolation of the larger
+    element's corners, which keeps the coarse/fine interfaces conforming.
+    Returns (interpolation, masters): a sparse (n_nodes, n_masters)
+    matrix mapping master displacements to all nodes, and the master node
+    indices. interpolation is None when no node hangs.
+    """
+    rows, cols, weights = [], [], []
+    for size in np.unique(sizes[sizes > 1]):
+        axis_points = np.arange(size + 1)
+        points = np.stack(np.meshgrid(axis_points, axis_points, axis_points, indexing='ij'),
+                          axis=-1).reshape(-1, 3)
+        extreme = (points == 0) | (points == size)
+        points = points[extreme.any(axis=1) & ~extreme.all(axis=1)]
+        point_weights = shape_functions(points / size)
+
+        selected = np.flatnonzero(sizes == size)
+        for begin in range(0, len(selected), _ASSEMBLY_BATCH):
+            batch = selected[begin:begin + _ASSEMBLY_BATCH]
+            candidates = origins[batch][:, None, :] + points[None, :, :]
+            candidate_ids = np.ravel_multi_index(candidates.reshape(-1, 3).T, lattice_shape)
+            index = np.minimum(np.searchsorted(node_ids, candidate_ids), len(node_ids) - 1)
+            found = (node_ids[index] == candidate_ids).reshape(len(batch), len(points))
+            element, point = np.nonzero(found)
+            rows.append(np.repeat(index.reshape(found.shape)[element, point], 8))
+            cols.append(elements[batch[element]].ravel())
+            weights.append(point_weights[point].ravel())
+
+    n_nodes = len(node_ids)
+    rows = np.concatenate(rows) if rows else np.zeros(0, dtype=int)
+    if not len(rows):
+        return None, np.arange(n_nodes)
+    cols = np.concatenate(cols)
+    weights = np.concatenate(weights)
+    # Nodes on a shared edge are found once per element; the interpolations agree
+    hanging, first = np.unique(rows[::8], return_index=True)
+    keep = (first[:, None] * 8 + np.arange(8)).ravel()
+    rows, cols, weights = rows[keep], cols[keep], weights[keep]
+    nonzero = weights != 0
+
+    masters = np.setdiff1d(np.arange(n_nodes), hanging)
+    interpolation = sp.csr_matrix(
+        (np.concatenate([np.ones(len(masters)), weights[nonzero]]),
+         (np.concatenate([masters, rows[nonzero]]), np.concatenate([masters, cols[nonzero]]))),
+        shape=(n_nodes, n_nodes),
+    )
+    # A corner of a coarse element can itself hang on an even larger one
+    while interpolation[:, hanging].nnz:
+        interpolation = interpolation @ interpolation
+    return interpolation[:, masters].tocsr(), masters
+
+
+def voxel_node_count(mask: np.ndarray) -> int:
+    """Number of nodes of the one-element-per-voxel mesh of a mask."""
+    padded = np.pad(mask, 1)
+    nodes = np.zeros(np.array(mask.shape) + 1, dtype=bool)
+    for dx, dy, dz in _NODE_OFFSETS:
+        nodes |= padded[dx:dx + nodes.shape[0], dy:dy + nodes.shape[1], dz:dz + nodes.shape[2]]
+    return int(nodes.sum())
+
+
+def assemble_stiffness(elements: np.ndarray, sizes: np.ndarray, n_nodes: int,
+                       Ke: np.ndarray, voxel_size: float) -> sp.csr_matrix:
+    """Assemble the global stiffness matrix (for E = 1) in batches."""
+    n_dofs = 3 * n_nodes
+    ke_flat = Ke.ravel()
+    parts = []
+    for begin in range(0, len(elements), _ASSEMBLY_BATCH):
+        batch = elements[begin:begin + _ASSEMBLY_BATCH]
+        dofs = (3 * batch[:, :, None] + np.arange(3)).reshape(len(batch), 24)
+        rows = np.repeat(dofs, 24, axis=1).ravel()
+        cols = np.tile(dofs, (1, 24)).ravel()
+        scale = sizes[begin:begin + _ASSEMBLY_BATCH] * voxel_size
+        data = (scale[:, None] * ke_flat[None, :]).ravel()
+        # Summing duplicates per batch keeps the triplets close to the final nnz
+        parts.append(sp.coo_matrix((data, (rows, cols)), shape=(n_dofs, n_dofs)).tocsr().tocoo())
+    rows = np.concatenate([part.row for part in parts])
+    cols = np.concatenate([part.col for part in parts])
+    data = np.concatenate([part.data for part in parts])
+    return sp.csr_matrix((data, (rows, cols)), shape=(n_dofs, n_dofs))
+
+
+def rigid_body_modes(coordinates: np.ndarray) -> np.ndarray:
+    """(3n, 6) translations and rotations, the near-null space for AMG."""
+    n = len(coordinates)
+    centred = coordinates - coordinates.mean(axis=0)
+    x, y, z = centred.T
+    modes = np.zeros((3 * n, 6))
+    for axis in range(3):
+        modes[axis::3, axis] = 1.0
+    modes[0::3, 3], modes[1::3, 3] = -y, x
+    modes[1::3, 4], modes[2::3, 4] = -z, y
+    modes[0::3, 5], modes[2::3, 5] = z, -x
+    return modes
+
+
+def pcg(A, b: np.ndarray, precondition, tolerance: float = 1e-6,
+        max_iterations: int = 5000):
+    """Preconditioned conjugate gradients.
+
+    Returns (x, iterations, relative_residual).
+    """
+    x = np.zeros_like(b)
+    b_norm = np.linalg.norm(b)
+    if b_norm == 0:
+        return x, 0, 0.0
+    r = b.copy()
+    z = precondition(r)
+    p = z.copy()
+    rz = r @ z
+    residual = 1.0
+    for iteration in range(1, max_iterations + 1):
+        Ap = A @ p
+        alpha = rz / (p @ Ap)
+        x += alpha * p
+        r -= alpha * Ap
+        residual = np.linalg.norm(r) / b_norm
+        if residual < tolerance:
+            return x, iteration, residual
+        z = precondition(r)
+        rz_next = r @ z
+        p = z + (rz_next / rz) * p
+        rz = rz_next
+    return x, max_iterations, residual
+
+
+class FEAModel:
+    """Assembled voxel geometry plus reduced systems per boundary condition."""
+
+    def __init__(self, grid: np.ndarray, voxel_size: float, poisson_ratio: float,
+                 coarsening_levels: int = 0, fine_layers: int = 1, homogeneity: float = 0.05):
+        start = time.perf_counter()
+        mask = largest_component(grid >= OCCUPANCY_THRESHOLD)
+        self.voxels = int(mask.sum())
+        self.dropped_voxels = int((grid >= OCCUPANCY_THRESHOLD).sum()) - self.voxels
+        self.voxel_size = voxel_size
+        self.poisson_ratio = poisson_ratio
+        self.origins, self.sizes = octree_blocks(np.where(mask, grid, 0), mask, coarsening_levels,
+                                                 fine_layers, homogeneity)
+        lattice_shape = np.array(mask.shape) + 2 ** coarsening_levels + 1
+        self.nodes, self.elements, node_ids = hex_mesh(self.origins, self.sizes, lattice_shape)
+        self.coordinates = self.nodes * voxel_size
+        K = assemble_stiffness(self.elements, self.sizes, len(self.nodes),
+                               unit_hex_stiffness(poisson_ratio), voxel_size)
+        interpolation, self.masters = hanging_node_interpolation(
+            node_ids, self.elements, self.origins, self.sizes, lattice_shape)
+        if interpolation is None:
+            self.transform = None
+            self.K = K
+        else:
+            # Condense the hanging nodes out: K_masters = T^T K T
+            self.transform = sp.kron(interpolation, sp.identity(3), format='csr')
+            self.K = (self.transform.T @ K @ self.transform).tocsr()
+        self.full_resolution_dofs = 3 * voxel_node_count(mask)
+        self.assembly_time = time.perf_counter() - start
+        self.systems = {}
+
+    @property
+    def n_dofs(self) -> int:
+        return self.K.shape[0]
+
+    def expand(self, displacement: np.ndarray) -> np.ndarray:
+        """Displacements of all nodes from those of the master nodes."""
+        if self.transform is None:
+            return displacement
+        return self.transform @ displacement
+
+    def face_nodes(self, face: str) -> np.ndarray:
+        """Indices (among the master nodes) of the nodes on one face of the part's bounding box."""
+        if face not in FACES:
+            raise ValueError(f"Unknown face '{face}', expected one of {', '.join(FACES)}")
+        axis = 'xyz'.index(face[0])
+        values = self.nodes[self.masters, axis]
+        target = values.min() if face[1] == '-' else values.max()
+        return np.flatnonzero(values == target)
+
+    def system(self, fixed_face: str, loaded_face: str, preconditioner: str):
+        """Reduced system and preconditioner for a pair of faces (cached)."""
+        key = (fixed_face, loaded_face, preconditioner)
+        if key in self.systems:
+            return self.systems[key], True
+
+        if fixed_face == loaded_face:
+            raise ValueError("The fixed and loaded faces must differ")
+        fixed = self.face_nodes(fixed_face)
+        loaded = np.setdiff1d(self.face_nodes(loaded_face), fixed)
+        axis = 'xyz'.index(loaded_face[0])
+        fixed_dofs = (3 * fixed[:, None] + np.arange(3)).ravel()
+        loaded_dofs = 3 * loaded + axis
+        prescribed = np.concatenate([fixed_dofs, loaded_dofs])
+        free = np.setdiff1d(np.arange(self.n_dofs), prescribed)
+
+        K_ff = self.K[free][:, free].tocsr()
+        K_fp = self.K[free][:, loaded_dofs].tocsr()
+        if preconditioner == 'amg':
+            free_modes = rigid_body_modes(self.coordinates[self.masters])[free]
+            hierarchy = pyamg.smoothed_aggregation_solver(K_ff, B=free_modes, symmetry='symmetric')
+            operator = hierarchy.aspreconditioner(cycle='V')
+            precondition = operator.matvec
+        else:
+            inverse_diagonal = 1.0 / K_ff.diagonal()
+            precondition = lambda r: inverse_diagonal * r
+        system = {
+            'free': free,
+            'loaded_dofs': loaded_dofs,
+            'axis': axis,
+            'sign': 1.0 if loaded_face[1] == '+' else -1.0,
+            'K_ff': K_ff,
+            'K_fp': K_fp,
+            'precondition': precondition,
+        }
+        self.systems[key] = system
+        return system, False
+
+
+def geometry_key(grid: np.ndarray, voxel_size: float, poisson_ratio: float,
+                 mesh_settings: tuple) -> str:
+    """Cache key of an assembled geometry (E only scales K, so it is left out)."""
+    digest = hashlib.sha1(np.ascontiguousarray(grid).tobytes())
+    digest.update(repr((grid.shape, str(grid.dtype), voxel_size, poisson_ratio,
+                        mesh_settings)).encode())
+    return digest.hexdigest()
+
+
+def get_model(grid: np.ndarray, voxel_size: float, poisson_ratio: float,
+              coarsening_levels: int = 0, fine_layers: int = 1, homogeneity: float = 0.05):
+    """Return (model, reused) for a geometry, assembling it on a cache miss."""
+    mesh_settings = (coarsening_levels, fine_layers, homogeneity)
+    key = geometry_key(grid, voxel_size, poisson_ratio, mesh_settings)
+    if key in _models:
+        _models.move_to_end(key)
+        return _models[key], True
+    model = FEAModel(grid, voxel_size, poisson_ratio, *mesh_settings)
+    _models[key] = model
+    while len(_models) > _MAX_CACHED_MODELS:
+        _models.popitem(last=False)
+    return model, False
+
+
+def element_stresses(model: FEAModel, displacement: np.ndarray,
+                     youngs_modulus: float) -> np.ndarray:
+    """(m, 6) stresses at element centroids."""
+    B = strain_displacement((0.5, 0.5, 0.5))
+    D = elasticity_matrix(youngs_modulus, model.poisson_ratio)
+    element_u = displacement.reshape(-1, 3)[model.elements].reshape(len(model.elements), 24)
+    strains = (element_u @ B.T) / (model.sizes * model.voxel_size)[:, None]
+    return strains @ D.T
+
+
+def von_mises(stress: np.ndarray) -> np.ndarray:
+    sxx, syy, szz, sxy, syz, szx = stress.T
+    return np.sqrt(0.5 * ((sxx - syy) ** 2 + (syy - szz) ** 2 + (szz - sxx) ** 2)
+                   + 3 * (sxy ** 2 + syz ** 2 + szx ** 2))
+
+
+def solve_load_case(model: FEAModel, load_case: dict) -> dict:
+    """Solve one prescribed-displacement load case on an assembled model."""
+    case = dict(DEFAULT_LOAD_CASE, **load_case)
+    preconditioner = case['preconditioner']
+    if preconditioner == 'auto':
+        preconditioner = 'amg' if PYAMG_AVAILABLE else 'jacobi'
+    elif preconditioner == 'amg' and not PYAMG_AVAILABLE:
+        raise ValueError("AMG preconditioning needs pyamg (pip install pyamg)")
+
+    start = time.perf_counter()
+    system, reused = model.system(case['fixed_face'], case['loaded_face'], preconditioner)
+    setup_time = time.perf_counter() - start
+
+    axis = system['axis']
+    extent = np.ptp(model.coordinates[model.masters, axis])
+    applied = system['sign'] * case['strain'] * extent
+    u_prescribed = np.full(len(system['loaded_dofs']), applied)
+
+    start = time.perf_counter()
+    u_free, iterations, residual = pcg(
+        system['K_ff'], -(system['K_fp'] @ u_prescribed), system['precondition'],
+        case['tolerance'], case['max_iterations'],
+    )
+    solve_time = time.perf_counter() - start
+
+    displacement = np.zeros(model.n_dofs)
+    displacement[system['free']] = u_free
+    displacement[system['loaded_dofs']] = u_prescribed
+    reaction = case['youngs_modulus'] * (model.K @ displacement)[system['loaded_dofs']].sum()
+    displacement = model.expand(displacement)
+    stress = element_stresses(model, displacement, case['youngs_modulus'])
+
+    return {
+        'displacement': displacement.reshape(-1, 3),
+        'stress': stress,
+        'von_mises': von_mises(stress),
+        'preconditioner': preconditioner,
+        'system_reused': reused,
+        'setup_time': setup_time,
+        'solve_time': solve_time,
+        'iterations': iterations,
+        'residual': float(residual),
+        'converged': bool(residual < case['tolerance']),
+        'applied_displacement': float(applied),
+        'reaction_force': float(system['sign'] * reaction),
+    }
+
+
+def write_fea_surface(model: FEAModel, solution: dict, output_path: str):
+    """Save the outer surface with displacement and stress fields as VTK PolyData."""
+    import pyvista as pv
+    from vtkmodules.vtkFiltersGeometry import vtkDataSetSurfaceFilter
+
+    grid = pv.UnstructuredGrid({pv.CellType.HEXAHEDRON: model.elements},
+                               model.coordinates.astype(np.float64))
+    grid.point_data['Displacement'] = solution['displacement']
+    grid.point_data['Displacement Magnitude'] = np.linalg.norm(solution['displacement'], axis=1)
+    grid.cell_data['von Mises Stress'] = solution['von_mises']
+    axis = solution['loaded_axis']
+    grid.cell_data[f'Stress {axis.upper() * 2}'] = solution['stress'][:, 'xyz'.index(axis)]
+    # Plain VTK filter: pyvista's wrappers for it are being deprecated
+    surface_filter = vtkDataSetSurfaceFilter()
+    surface_filter.SetInputData(grid)
+    surface_filter.Update()
+    pv.wrap(surface_filter.GetOutput()).save(str(output_path))
+
+
+def run_fea(stl_path: str, load_case: dict) -> dict:
+    """Run FEA on the voxel grid retained with an STL and save the result surface.
+
+    Returns solver statistics plus 'result_path'. Meant to run in a
+    long-lived worker process so assembled geometries stay cached.
+    """
+    loaded = load_voxel_grid(stl_path, mmap=False)
+    if loaded is None:
+        raise FileNotFoundError(
+            f"No voxel grid saved with {stl_path}; re-run the simulation to create one"
+        )
+    grid, voxel_size = loaded
+    if not (grid >= OCCUPANCY_THRESHOLD).any():
+        raise ValueError("The voxel grid is empty")
+
+    case = dict(DEFAULT_LOAD_CASE, **load_case)
+    model, geometry_reused = get_model(grid, voxel_size, case['poisson_ratio'],
+                                       case['coarsening_levels'], case['fine_layers'],
+                                       case['homogeneity'])
+    solution = solve_load_case(model, case)
+    solution['loaded_axis'] = case['loaded_face'][0]
+
+    result_path = fea_result_path(stl_path)
+    write_fea_surface(model, solution, result_path)
+
+    return {
+        'result_path': str(result_path),
+        'elements': len(model.elements),
+        'voxels': model.voxels,
+        'dofs': model.n_dofs,
+        'full_resolution_dofs': model.full_resolution_dofs,
+        'dropped_voxels': model.dropped_voxels,
+        'geometry_reused': geometry_reused,
+        'assembly_time': model.assembly_time,
+        'max_displacement': float(np.linalg.norm(solution['displacement'], axis=1).max()),
+        'max_von_mises': float(solution['von_mises'].max()),
+        **{key: solution[key] for key in (
+            'preconditioner', 'system_reused', 'setup_time', 'solve_time', 'iterations',
+            'residual', 'converged', 'applied_displacement', 'reaction_force',
+        )},
+    }
+
+
+def _voxel_owners(model: FEAModel, shape) -> np.ndarray:
+    """Index of the element covering each voxel (-1 outside the part)."""
+    padded = np.array(shape) + int(model.sizes.max())
+    owners = np.full(padded, -1, dtype=np.int64)
+    for size in np.unique(model.sizes):
+        selected = np.flatnonzero(model.sizes == size)
+        origins = model.origins[selected]
+        for offset in np.ndindex(size, size, size):
+            x, y, z = (origins + offset).T
+            owners[x, y, z] = selected
+    return owners[:shape[0], :shape[1], :shape[2]]
+
+
+def compare_with_full_resolution(grid: np.ndarray, voxel_size: float, load_case: dict) -> dict:
+    """Solve a load case on the coarsened and the one-element-per-voxel mesh.
+
+    Returns the DOF reduction and the relative errors of the coarsened
+    solution: reaction force, nodal displacements (L2 over the coarse
+    mesh's nodes) and von Mises stress (L2 over voxels).
+    """
+    case = dict(DEFAULT_LOAD_CASE, **load_case)
+    full = FEAModel(grid, voxel_size, case['poisson_ratio'], 0)
+    coarse = FEAModel(grid, voxel_size, case['poisson_ratio'], case['coarsening_levels'],
+                      case['fine_layers'], case['homogeneity'])
+    full_solution = solve_load_case(full, case)
+    coarse_solution = solve_load_case(coarse, case)
+
+    # Every coarse mesh node is also a node of the full mesh
+    lattice_shape = np.array(grid.shape) + 2 ** case['coarsening_levels'] + 1
+    full_ids = np.ravel_multi_index(full.nodes.T, lattice_shape)
+    coarse_ids = np.ravel_multi_index(coarse.nodes.T, lattice_shape)
+    order = np.argsort(full_ids)
+    matching = order[np.searchsorted(full_ids, coarse_ids, sorter=order)]
+    reference = full_solution['displacement'][matching]
+    displacement_error = (np.linalg.norm(coarse_solution['displacement'] - reference)
+                          / np.linalg.norm(reference))
+
+    # Full mesh elements are voxels; look up the coarse element covering each
+    owners = _voxel_owners(coarse, grid.shape)
+    x, y, z = full.origins.T
+    reference = full_solution['von_mises']
+    stress_error = (np.linalg.norm(coarse_solution['von_mises'][owners[x, y, z]] - reference)
+                    / np.linalg.norm(reference))
+
+    return {
+        'full_dofs': full.n_dofs,
+        'coarse_dofs': coarse.n_dofs,
+        'dof_reduction': full.n_dofs / coarse.n_dofs,
+        'full_elements': len(full.elements),
+        'coarse_elements': len(coarse.elements),
+        'full_solve_time': full.assembly_time + full_solution['setup_time'] + full_solution['solve_time'],
+        'coarse_solve_time': (coarse.assembly_time + coarse_solution['setup_time']
+                              + coarse_solution['solve_time']),
+        'reaction_error': abs(coarse_solution['reaction_force'] / full_solution['reaction_force'] - 1),
+        'displacement_error': float(displacement_error),
+        'stress_error': float(stress_error),
+    }
+
+
+def benchmark_parts() -> dict:
+    """Synthetic voxel grids for checking the coarsened mesher."""
+    parts = {}
+
+    parts['block'] = np.ones((48, 48, 48), dtype=np.float32)
+
+    x, y = np.meshgrid(np.arange(96), np.arange(48), indexing='ij')
+    hole = (x - 47.5) ** 2 + (y - 23.5) ** 2 < 12 ** 2
+    plate = np.ones((96, 48, 12), dtype=np.float32)
+    plate[hole] = 0
+    parts['plate_with_hole'] = plate
+
+    bracket = np.zeros((64, 24, 64), dtype=np.float32)
+    bracket[:, :, :16] = 1
+    bracket[:16, :, :] = 1
+    parts['l_bracket'] = bracket
+
+    # Weaker, partially filled voxels between layers, as at filament boundaries
+    layered = np.ones((48, 48, 48), dtype=np.float32)
+    layered[:, :, 5::6] = 0.8
+    parts['layered_block'] = layered
+    return parts
+
+
+def main():
+    """Report coarsening DOF reduction and error on benchmark parts or a result."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Compare octree-coarsened FEA meshes against one element per voxel")
+    parser.add_argument('stl', nargs='?', help="Result STL with a saved voxel grid "
+                                               "(default: built-in benchmark parts)")
+    parser.add_argument('--levels', type=int, default=DEFAULT_LOAD_CASE['coarsening_levels'])
+    parser.add_argument('--fine-layers', type=int, default=DEFAULT_LOAD_CASE['fine_layers'])
+    parser.add_argument('--voxel-size', type=float, default=0.1,
+                        help="Voxel size of the benchmark parts in mm")
+    args = parser.parse_args()
+
+    if args.stl:
+        loaded = load_voxel_grid(args.stl, mmap=False)
+        if loaded is None:
+            parser.error(f"No voxel grid saved with {args.stl}")
+        parts = {Path(args.stl).stem: loaded}
+    else:
+        parts = {name: (grid, args.voxel_size) for name, grid in benchmark_parts().items()}
+
+    load_case = {'coarsening_levels': args.levels, 'fine_layers': args.fine_layers}
+    print(f"{'part':<18}{'DOFs':>10}{'coarse':>10}{'reduction':>11}"
+          f"{'reaction':>10}{'displ.':>9}{'stress':>9}{'time':>14}")
+    for name, (grid, voxel_size) in parts.items():
+        report = compare_with_full_resolution(grid, voxel_size, load_case)
+        print(f"{name:<18}{report['full_dofs']:>10,}{report['coarse_dofs']:>10,}"
+              f"{report['dof_reduction']:>10.1f}x"
+              f"{report['reaction_error']:>9.2%}{report['displacement_error']:>9.2%}"
+              f"{report['stress_error']:>9.2%}"
+              f"{report['full_solve_time']:>7.1f}/{report['coarse_solve_time']:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Background FEA runs in a long-lived worker process."""
+
+import atexit
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from volcogui.backend.fea import run_fea
+from volcogui.backend.processes import spawn_executor
+
+
+# One persistent process, so assembled stiffness matrices survive between load cases
+_executor = None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = spawn_executor(1)
+    return _executor
+
+
+def shutdown_fea_process():
+    """Stop the FEA process, dropping its cached geometries."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+atexit.register(shutdown_fea_process)
+
+
+class FEAWorker(QThread):
+    """Worker thread that runs one FEA load case in the FEA process."""
+
+    # Signals
+    progress = pyqtSignal(str)   # Progress message
+    finished = pyqtSignal(dict)  # Solver statistics, including 'result_path'
+    error = pyqtSignal(str)      # Error message
+
+    def __init__(self, stl_path: str, load_case: dict):
+        super().__init__()
+        self.stl_path = stl_path
+        self.load_case = load_case
+
+    def run(self):
+        """Run the load case and report solver statistics."""
+        try:
+            self.progress.emit("Running FEA (assembly is reused for the same geometry)...")
+            try:
+                stats = _get_executor().submit(run_fea, self.stl_path, self.load_case).result()
+            except BrokenProcessPool:
+                # The FEA process died (e.g. out of memory); start a fresh one next time
+                shutdown_fea_process()
+                raise RuntimeError("The FEA process exited unexpectedly (out of memory?)")
+            self.finished.emit(stats)
+        except Exception as e:
+            self.error.emit(f"FEA failed: {e}")
@@ -0,0 +1,126 @@
+"""Lightweight G-code move parser and writer used by the pre-processing stages."""
+
+import re
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+
+# One record per G0/G1 move, in file order
+MOVE_DTYPE = np.dtype([
+    ('line', '<i8'),        # index into the file's lines
+    ('start', '<f8', (3,)),
+    ('end', '<f8', (3,)),
+    ('e_start', '<f8'),     # absolute E before the move
+    ('e', '<f8'),           # filament length extruded by the move
+    ('feed', '<f8'),        # mm/s
+    ('abs_xyz', '?'),
+    ('abs_e', '?'),
+])
+
+# Slicers write comments in whatever code page the user's locale uses (°, µ,
+# accented names); Latin-1 decodes every byte and writes it back unchanged
+GCODE_ENCODING = 'latin-1'
+
+WORD_RE = re.compile(r'([A-Z])\s*([-+]?(?:\d+\.?\d*|\.\d+))')
+
+
+def strip_comment(line: str) -> str:
+    """Remove ';' and '( ... )' comments from a G-code line."""
+    line = line.split(';', 1)[0]
+    if '(' in line:
+        line = re.sub(r'\(.*?\)', '', line)
+    return line.strip()
+
+
+def parse_words(line: str) -> dict:
+    """Parse 'G1 X1 Y2 E0.5' into {'G': 1.0, 'X': 1.0, ...} (comments removed)."""
+    return {letter: float(value) for letter, value in WORD_RE.findall(strip_comment(line).upper())}
+
+
+def iter_moves(lines: Iterable[str]) -> Iterator[Tuple[int, str, Optional[tuple]]]:
+    """Yield (index, line, move) for every line; move is a MOVE_DTYPE tuple or None.
+
+    Tracks G90/G91, M82/M83 and G92 so every move has absolute start and end
+    coordinates. Arcs and other commands are passed through as plain lines.
+    Works on any iterable of lines, so files can be streamed.
+    """
+    position = [0.0, 0.0, 0.0]
+    e_position = 0.0
+    feed = 0.0
+    abs_xyz = True
+    abs_e = True
+
+    for index, line in enumerate(lines):
+        line = line.rstrip('\r\n')
+        move = None
+        words = parse_words(line)
+        if 'G' in words:
+            code = words['G']
+            if code in (0, 1):
+                start = list(position)
+                for axis, letter in enumerate('XYZ'):
+                    if letter in words:
+                        position[axis] = words[letter] if abs_xyz else position[axis] + words[letter]
+                e_start = e_position
+                if 'E' in words:
+                    e_position = words['E'] if abs_e else e_position + words['E']
+                if 'F' in words:
+                    feed = words['F'] / 60.0
+                move = (index, start, list(position), e_start, e_position - e_start,
+                        feed, abs_xyz, abs_e)
+            elif code == 90:
+                abs_xyz = True
+            elif code == 91:
+                abs_xyz = False
+            elif code == 92:
+                for axis, letter in enumerate('XYZ'):
+                    if letter in words:
+                        position[axis] = words[letter]
+                if 'E' in words:
+                    e_position = words['E']
+            elif code in (2, 3):
+                for axis, letter in enumerate('XYZ'):
+                    if letter in words:
+                        position[axis] = words[letter] if abs_xyz else position[axis] + words[letter]
+                if 'E' in words:
+                    e_position = words['E'] if abs_e else e_position + words['E']
+        elif 'M' in words:
+            if words['M'] == 82:
+                abs_e = True
+            elif words['M'] == 83:
+                abs_e = False
+        yield index, line, move
+
+
+def read_moves(gcode_path: str) -> Tuple[List[str], np.ndarray]:
+    """Read a G-code file and return its lines and an array of moves (MOVE_DTYPE)."""
+    lines = Path(gcode_path).read_text(encoding=GCODE_ENCODING).splitlines()
+    moves = [move for _, _, move in iter_moves(lines) if move is not None]
+    return lines, np.array(moves, dtype=MOVE_DTYPE)
+
+
+def extrusion_mask(moves: np.ndarray) -> np.ndarray:
+    """Moves that travel in space while extruding, i.e. Volco filaments."""
+    lengths = np.linalg.norm(moves['end'] - moves['start'], axis=1)
+    return (moves['e'] > 0) & (lengths > 0)
+
+
+def _fmt(value: float) -> str:
+    text = f"{value:.5f}".rstrip('0').rstrip('.')
+    return '0' if text in ('', '-0') else text
+
+
+def format_move(move, start, end, e_start: float, e: float, feed: float = None) -> str:
+    """Format a G1 from start to end extruding e, honouring the move's positioning modes."""
+    words = ['G1']
+    for axis, letter in enumerate('XYZ'):
+        if end[axis] != start[axis]:
+            value = end[axis] if move['abs_xyz'] else end[axis] - start[axis]
+            words.append(f"{letter}{_fmt(value)}")
+    if e:
+        words.append(f"E{_fmt(e_start + e if move['abs_e'] else e)}")
+    if feed:
+        words.append(f"F{_fmt(feed * 60.0)}")
+    return ' '.join(words)
@@ -0,0 +1,129 @@
+"""Fast NumPy mesh I/O for simulation results.
+
+Binary STL is read and written with a single structured-dtype pass, and
+results are cached next to the STL as an indexed (welded) mesh so the
+viewer does not have to re-parse triangle soup and merge points.
+"""
+
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+# One binary STL facet record: normal, three vertices, attribute byte count
+STL_FACET_DTYPE = np.dtype([
+    ('normal', '<f4', (3,)),
+    ('vertices', '<f4', (3, 3)),
+    ('attr', '<u2'),
+])
+
+STL_HEADER_SIZE = 80
+SIDECAR_SUFFIX = '.mesh.npz'
+
+
+def is_binary_stl(stl_path: str) -> bool:
+    """Check whether a file is a binary STL by its size and facet count."""
+    path = Path(stl_path)
+    size = path.stat().st_size
+    if size < STL_HEADER_SIZE + 4:
+        return False
+    with open(path, 'rb') as f:
+        f.seek(STL_HEADER_SIZE)
+        count = int(np.frombuffer(f.read(4), dtype='<u4')[0])
+    return size == STL_HEADER_SIZE + 4 + count * STL_FACET_DTYPE.itemsize
+
+
+def read_binary_stl(stl_path: str) -> np.ndarray:
+    """Read a binary STL into an (n, 3, 3) float32 array of triangles."""
+    with open(stl_path, 'rb') as f:
+        f.seek(STL_HEADER_SIZE)
+        count = int(np.frombuffer(f.read(4), dtype='<u4')[0])
+        facets = np.fromfile(f, dtype=STL_FACET_DTYPE, count=count)
+    if len(facets) != count:
+        raise ValueError(f"Truncated STL file: expected {count} facets, found {len(facets)}")
+    return facets['vertices']
+
+
+def write_binary_stl(stl_path: str, vertices: np.ndarray, faces: np.ndarray,
+                     header: bytes = b'VolcoGUI binary STL'):
+    """Write an indexed triangle mesh as binary STL in one write."""
+    vertices = np.asarray(vertices, dtype=np.float32)
+    faces = np.asarray(faces, dtype=np.int64)
+    triangles = vertices[faces]
+
+    facets = np.zeros(len(faces), dtype=STL_FACET_DTYPE)
+    facets['vertices'] = triangles
+    normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    np.divide(normals, lengths, out=normals, where=lengths > 0)
+    facets['normal'] = normals
+
+    with open(stl_path, 'wb') as f:
+        f.write(header[:STL_HEADER_SIZE].ljust(STL_HEADER_SIZE, b'\0'))
+        f.write(np.uint32(len(facets)).tobytes())
+        facets.tofile(f)
+
+
+def weld_triangles(triangles: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Merge identical triangle corners into shared vertices.
+
+    Returns (vertices, faces) where faces indexes into vertices.
+    """
+    corners = np.ascontiguousarray(triangles, dtype=np.float32).reshape(-1, 3)
+    # Compare corners as opaque 12-byte keys, much faster than unique(axis=0)
+    keys = corners.view(np.dtype((np.void, corners.dtype.itemsize * 3))).ravel()
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    vertices = corners[first]
+    faces = inverse.reshape(-1, 3).astype(np.int32)
+    return vertices, faces
+
+
+def sidecar_path(stl_path: str) -> Path:
+    """Path of the indexed mesh cache that belongs to an STL file."""
+    path = Path(stl_path)
+    return path.with_name(path.stem + SIDECAR_SUFFIX)
+
+
+def write_indexed_mesh(path: str, vertices: np.ndarray, faces: np.ndarray):
+    """Write welded vertices and faces as an uncompressed .npz."""
+    with open(path, 'wb') as f:
+        np.savez(f, vertices=np.asarray(vertices, dtype=np.float32),
+                 faces=np.asarray(faces, dtype=np.int32))
+
+
+def read_indexed_mesh(path: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Read welded vertices and faces written by write_indexed_mesh."""
+    with np.load(path) as data:
+        return data['vertices'], data['faces']
+
+
+def write_sidecar(stl_path: str) -> Optional[Path]:
+    """Weld a binary STL and cache it next to the STL.
+
+    Returns the sidecar path, or None if the STL is not binary.
+    """
+    if not is_binary_stl(stl_path):
+        return None
+    vertices, faces = weld_triangles(read_binary_stl(stl_path))
+    cache = sidecar_path(stl_path)
+    write_indexed_mesh(str(cache), vertices, faces)
+    return cache
+
+
+def load_indexed_mesh(stl_path: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """Load an STL as (vertices, faces), preferring a fresh sidecar cache.
+
+    Returns None for ASCII STL files so callers can fall back to a generic reader.
+    """
+    cache = sidecar_path(stl_path)
+    if cache.exists() and cache.stat().st_mtime >= Path(stl_path).stat().st_mtime:
+        return read_indexed_mesh(str(cache))
+    if not is_binary_stl(stl_path):
+        return None
+    vertices, faces = weld_triangles(read_binary_stl(stl_path))
+    try:
+        write_indexed_mesh(str(cache), vertices, faces)
+    except OSError:
+        pass
+    return vertices, faces
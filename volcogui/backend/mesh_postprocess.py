@@ -0,0 +1,135 @@
+"""Mesh post-processing for marching-cubes output: weld, smooth, decimate.
+
+The heavy lifting runs in a separate process so the GUI (and the GIL of
+the simulation thread) stays free while large meshes are processed.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+from volcogui.backend.mesh_io import (
+    is_binary_stl, read_binary_stl, weld_triangles,
+    write_binary_stl, write_indexed_mesh, sidecar_path,
+)
+from volcogui.backend.processes import spawn_executor
+
+
+DEFAULT_SETTINGS = {
+    'enabled': False,
+    'weld_tolerance': 0.0,      # mm, 0 = merge only identical vertices
+    'smooth_iterations': 0,     # Taubin iterations, 0 = off
+    'smooth_lambda': 0.5,
+    'smooth_mu': -0.53,
+    'target_triangles': 0,      # 0 = no decimation by count
+    'max_error': 0.0,           # mm, 0 = no error bound
+}
+
+
+def weld_vertices(vertices: np.ndarray, faces: np.ndarray,
+                  tolerance: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    """Merge vertices closer than tolerance and drop collapsed faces."""
+    vertices = np.asarray(vertices, dtype=np.float32)
+    if tolerance > 0:
+        keys = np.ascontiguousarray(np.round(vertices / tolerance).astype(np.int64))
+    else:
+        keys = np.ascontiguousarray(vertices)
+    keys = keys.view(np.dtype((np.void, keys.dtype.itemsize * 3))).ravel()
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    faces = inverse.ravel()[faces]
+
+    # Welding can collapse small triangles to lines or points
+    keep = (faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 0] != faces[:, 2])
+    faces = faces[keep]
+
+    # Compact away vertices that only belonged to collapsed faces
+    used, faces = np.unique(faces, return_inverse=True)
+    return vertices[first][used], faces.reshape(-1, 3).astype(np.int32)
+
+
+def taubin_smooth(vertices: np.ndarray, faces: np.ndarray, iterations: int,
+                  lamb: float = 0.5, mu: float = -0.53) -> np.ndarray:
+    """Taubin (lambda|mu) smoothing, which removes stair-steps without shrinking."""
+    from scipy import sparse
+
+    n = len(vertices)
+    rows = faces.ravel()
+    cols = faces[:, [1, 2, 0]].ravel()
+    adjacency = sparse.coo_matrix(
+        (np.ones(2 * len(rows), dtype=np.float32),
+         (np.concatenate([rows, cols]), np.concatenate([cols, rows]))),
+        shape=(n, n),
+    ).tocsr()
+    # Shared edges are counted twice; only connectivity matters
+    adjacency.data[:] = 1.0
+    degree = np.asarray(adjacency.sum(axis=1)).ravel()
+    degree[degree == 0] = 1.0
+    inv_degree = (1.0 / degree)[:, None]
+
+    smoothed = np.asarray(vertices, dtype=np.float64).copy()
+    for _ in range(iterations):
+        for factor in (lamb, mu):
+            laplacian = adjacency @ smoothed * inv_degree - smoothed
+            smoothed += factor * laplacian
+    return smoothed.astype(np.float32)
+
+
+def quadric_decimate(vertices: np.ndarray, faces: np.ndarray, target_triangles: int = 0,
+                     max_error: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    """Quadric edge-collapse decimation to a triangle count and/or error bound."""
+    import pyvista as pv
+    from vtkmodules.vtkFiltersCore import vtkQuadricDecimation
+
+    if target_triangles and target_triangles >= len(faces):
+        return vertices, faces
+
+    mesh = pv.PolyData.from_regular_faces(vertices, faces)
+    decimator = vtkQuadricDecimation()
+    decimator.SetInputData(mesh)
+    decimator.VolumePreservationOn()
+    if target_triangles:
+        decimator.SetTargetReduction(1.0 - target_triangles / len(faces))
+    else:
+        # Error-bounded only: let the error limit decide where to stop
+        decimator.SetTargetReduction(0.99)
+    if max_error and hasattr(decimator, 'SetMaximumError'):
+        # Quadric error is a squared distance
+        decimator.SetMaximumError(max_error ** 2)
+    decimator.Update()
+
+    result = pv.wrap(decimator.GetOutput())
+    return np.asarray(result.points, dtype=np.float32), result.regular_faces.astype(np.int32)
+
+
+def postprocess_mesh_file(stl_path: str, settings: dict) -> dict:
+    """Post-process a binary STL in place and refresh its indexed sidecar.
+
+    Returns triangle and vertex counts before and after processing.
+    """
+    settings = {**DEFAULT_SETTINGS, **settings}
+    if not is_binary_stl(stl_path):
+        raise ValueError(f"Post-processing requires a binary STL: {stl_path}")
+
+    vertices, faces = weld_triangles(read_binary_stl(stl_path))
+    stats = {'input_triangles': len(faces), 'input_vertices': len(vertices)}
+
+    if settings['weld_tolerance'] > 0:
+        vertices, faces = weld_vertices(vertices, faces, settings['weld_tolerance'])
+    if settings['smooth_iterations'] > 0:
+        vertices = taubin_smooth(vertices, faces, settings['smooth_iterations'],
+                                 settings['smooth_lambda'], settings['smooth_mu'])
+    if settings['target_triangles'] > 0 or settings['max_error'] > 0:
+        vertices, faces = quadric_decimate(vertices, faces, settings['target_triangles'],
+                                           settings['max_error'])
+
+    write_binary_stl(stl_path, vertices, faces)
+    write_indexed_mesh(str(sidecar_path(stl_path)), vertices, faces)
+
+    stats.update({'output_triangles': len(faces), 'output_vertices': len(vertices)})
+    return stats
+
+
+def run_postprocess(stl_path: str, settings: dict) -> dict:
+    """Run postprocess_mesh_file in a worker process and wait for it."""
+    with spawn_executor(1) as executor:
+        return executor.submit(postprocess_mesh_file, stl_path, settings).result()
@@ -0,0 +1,14 @@
+"""Worker process pools for CPU-heavy backend work."""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+
+def spawn_executor(max_workers: int = 1, initializer=None) -> ProcessPoolExecutor:
+    """A process pool whose workers start from a fresh interpreter.
+
+    Spawn rather than fork: forking a process that owns Qt/VTK state is unsafe.
+    """
+    context = multiprocessing.get_context('spawn')
+    return ProcessPoolExecutor(max_workers=max(1, max_workers), mp_context=context,
+                               initializer=initializer)
@@ -0,0 +1,102 @@
+"""Coarse-to-fine progressive refinement of a simulation."""
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from volcogui.backend.simulation_runner import SimulationWorker
+
+
+def coarse_parameters(params: dict, factor: float = 3.0) -> dict:
+    """Parameters for a quick preview pass: larger voxels and steps, no post-processing.
+
+    Voxels stay below half the nozzle diameter so beads are still resolved,
+    and steps never exceed the voxel size.
+    """
+    voxel_size = max(params['voxel_size'], min(params['voxel_size'] * factor,
+                                               params['nozzle_diameter'] / 2))
+    step_size = max(params['step_size'], min(params['step_size'] * factor, voxel_size))
+    coarse = dict(params, voxel_size=voxel_size, step_size=step_size)
+    coarse['postprocess'] = None
+    return coarse
+
+
+class RefinementController(QObject):
+    """Runs a coarse preview pass, then a fine pass that replaces it.
+
+    Starting again (e.g. because parameters changed) cancels whatever is
+    still running; results from superseded runs are ignored.
+    """
+
+    progress = pyqtSignal(str)       # Progress message
+    preview_ready = pyqtSignal(str)  # Coarse STL path
+    refined = pyqtSignal(str)        # Fine STL path
+    error = pyqtSignal(str)          # Error message
+
+    def __init__(self, factor: float = 3.0):
+        super().__init__()
+        self.factor = factor
+        self.generation = 0
+        self.worker = None
+        self.gcode_path = None
+        self.fine_params = None
+        # Cancelled workers are kept alive until their threads exit
+        self._retired = []
+
+    def is_active(self) -> bool:
+        return self.worker is not None
+
+    def start(self, gcode_path: str, params: dict):
+        """Start (or restart) refinement for a G-code file."""
+        self.stop()
+        self.gcode_path = gcode_path
+        self.fine_params = params
+
+        coarse = coarse_parameters(params, self.factor)
+        if (coarse['voxel_size'], coarse['step_size']) == (params['voxel_size'], params['step_size']):
+            # Already coarse: a single pass is the final result
+            self._start_pass(params, "volco_refined", self._on_fine_finished)
+        else:
+            self._start_pass(coarse, "volco_preview", self._on_coarse_finished)
+
+    def stop(self):
+        """Cancel any running pass."""
+        self.generation += 1
+        if self.worker is not None:
+            self.worker.cancel()
+            self._retired.append(self.worker)
+            self.worker = None
+        self._retired = [w for w in self._retired if w.isRunning()]
+
+    def _start_pass(self, params: dict, output_name: str, on_finished):
+        generation = self.generation
+        # Isolated so a superseded pass can be killed without leaking state
+        worker = SimulationWorker(self.gcode_path, dict(params, output_name=output_name, isolated=True))
+        worker.progress.connect(lambda message: self._relay(generation, self.progress, message))
+        worker.finished.connect(lambda path: self._on_finished(generation, on_finished, path))
+        worker.error.connect(lambda message: self._on_error(generation, message))
+        self.worker = worker
+        worker.start()
+
+    def _relay(self, generation: int, signal, message: str):
+        if generation == self.generation:
+            signal.emit(message)
+
+    def _on_finished(self, generation: int, handler, stl_path: str):
+        if generation == self.generation:
+            handler(stl_path)
+
+    def _on_coarse_finished(self, stl_path: str):
+        self.preview_ready.emit(stl_path)
+        self._retired.append(self.worker)
+        self._start_pass(self.fine_params, "volco_refined", self._on_fine_finished)
+
+    def _on_fine_finished(self, stl_path: str):
+        self._retired.append(self.worker)
+        self.worker = None
+        self.refined.emit(stl_path)
+
+    def _on_error(self, generation: int, message: str):
+        if generation != self.generation:
+            return
+        self._retired.append(self.worker)
+        self.worker = None
+        self.error.emit(message)
@@ -0,0 +1,109 @@
+"""Region-of-interest pre-pass: drop G-code outside a window before deposition.
+
+Volco sizes its voxel space from the extent of the extruded filaments, so
+turning filaments outside the window (plus a halo) into travel moves and
+clipping the ones that cross its boundary makes runtime and memory scale
+with the region instead of the whole part.
+"""
+
+import numpy as np
+
+from volcogui.backend.gcode import GCODE_ENCODING, read_moves, extrusion_mask, format_move
+
+
+def region_bounds(region: dict):
+    """Lower/upper corner of the region grown by its halo; unset axes are unbounded."""
+    halo = region.get('halo', 0.0)
+    lower = np.full(3, -np.inf)
+    upper = np.full(3, np.inf)
+    for axis, name in enumerate('xyz'):
+        limits = region.get(name)
+        if limits is None:
+            continue
+        low, high = limits
+        if low is not None:
+            lower[axis] = low - halo
+        if high is not None:
+            upper[axis] = high + halo
+    return lower, upper
+
+
+def clip_segments(start: np.ndarray, end: np.ndarray, lower: np.ndarray, upper: np.ndarray):
+    """Liang-Barsky clip of many segments against one box.
+
+    Returns (t0, t1, inside): the kept parameter range along each segment and
+    whether any of it lies in the box.
+    """
+    direction = end - start
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_lower = (lower - start) / direction
+        t_upper = (upper - start) / direction
+    t_enter = np.minimum(t_lower, t_upper)
+    t_exit = np.maximum(t_lower, t_upper)
+
+    # Segments parallel to an axis are all-in or all-out along it
+    parallel = direction == 0
+    within = (start >= lower) & (start <= upper)
+    t_enter = np.where(parallel, np.where(within, -np.inf, np.inf), t_enter)
+    t_exit = np.where(parallel, np.where(within, np.inf, -np.inf), t_exit)
+    # inf - inf style NaNs from unbounded axes mean "no constraint"
+    t_enter = np.nan_to_num(t_enter, nan=-np.inf)
+    t_exit = np.nan_to_num(t_exit, nan=np.inf)
+
+    t0 = np.maximum(t_enter.max(axis=1), 0.0)
+    t1 = np.minimum(t_exit.min(axis=1), 1.0)
+    return t0, t1, t0 < t1
+
+
+def write_region_gcode(gcode_path: str, output_path: str, region: dict) -> dict:
+    """Write G-code that only extrudes inside the region (grown by region['halo']).
+
+    Filaments wholly outside become travel moves, filaments crossing the
+    boundary keep only their inside part with proportional extrusion.
+    Absolute-E files get a G92 after each change so later moves are unaffected.
+    Returns filament counts.
+    """
+    lines, moves = read_moves(gcode_path)
+    lower, upper = region_bounds(region)
+    is_filament = extrusion_mask(moves)
+    filaments = moves[is_filament]
+    t0, t1, inside = clip_segments(filaments['start'], filaments['end'], lower, upper)
+    clipped = inside & ((t0 > 0) | (t1 < 1))
+
+    replacements = {}
+    for i in np.flatnonzero(~inside | clipped):
+        move = filaments[i]
+        start, end = move['start'], move['end']
+        e_end = move['e_start'] + move['e']
+        if not inside[i]:
+            new_lines = [format_move(move, start, end, 0.0, 0.0, move['feed'])]
+        else:
+            direction = end - start
+            entry = start + direction * t0[i]
+            exit_ = start + direction * t1[i]
+            new_lines = []
+            if t0[i] > 0:
+                new_lines.append(format_move(move, start, entry, 0.0, 0.0))
+            new_lines.append(format_move(move, entry, exit_, move['e_start'],
+                                         move['e'] * (t1[i] - t0[i]), move['feed']))
+            if t1[i] < 1:
+                new_lines.append(format_move(move, exit_, end, 0.0, 0.0))
+        if move['abs_e']:
+            # Resynchronise absolute E with what the original file expects next
+            new_lines.append(f"G92 E{e_end:.5f}")
+        replacements[move['line']] = new_lines
+
+    with open(output_path, 'w', encoding=GCODE_ENCODING) as f:
+        for index, line in enumerate(lines):
+            if index in replacements:
+                f.write(f"; volcogui region of interest: {line.strip()}\n")
+                f.write('\n'.join(replacements[index]) + '\n')
+            else:
+                f.write(line + '\n')
+
+    return {
+        'filaments': len(filaments),
+        'kept': int(inside.sum()),
+        'clipped': int(clipped.sum()),
+        'dropped': int((~inside).sum()),
+    }
@@ -0,0 +1,232 @@
+"""Offscreen thumbnails and HTML reports for simulation results.
+
+Render every result in a folder with:
+    volcogui-report /shared/gcode --workers 4
+
+Each result STL gets an isometric thumbnail (<name>.png) drawn with the
+same scene as the 3D viewer, and a one-page report (<name>.html) with the
+thumbnail, mesh statistics, the voxel grid and the simulation parameters.
+The folder's volcogui_results.html is a contact sheet linking all reports,
+so a batch can be browsed in a web browser without loading any meshes.
+
+Rendering runs in spawned worker processes with VTK's offscreen window,
+so no display is needed. Workers ask Mesa for software rendering, which
+also leaves the GPU to the interactive viewer, and use OSMesa or EGL
+when VTK can find them.
+"""
+
+import argparse
+import ctypes.util
+import html
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+from volcogui.backend.processes import spawn_executor
+from volcogui.backend.resources import format_bytes
+from volcogui.backend.slices import fill_fraction
+from volcogui.backend.voxel_io import load_voxel_grid
+
+
+CONTACT_SHEET = 'volcogui_results.html'
+
+THUMBNAIL_SIZE = (400, 300)
+
+# Parameters that are bookkeeping rather than simulation settings
+HIDDEN_PARAMS = ('checkpoint_dir', 'resume', 'remote_engine')
+
+
+def thumbnail_path(stl_path) -> Path:
+    return Path(stl_path).with_suffix('.png')
+
+
+def report_path(stl_path) -> Path:
+    return Path(stl_path).with_suffix('.html')
+
+
+def _init_renderer():
+    """Prepare a worker process for offscreen software rendering."""
+    os.environ.setdefault('LIBGL_ALWAYS_SOFTWARE', '1')
+    if ctypes.util.find_library('OSMesa'):
+        os.environ.setdefault('VTK_DEFAULT_OPENGL_WINDOW', 'vtkOSOpenGLRenderWindow')
+    elif sys.platform.startswith('linux') and ctypes.util.find_library('EGL'):
+        # Skip VTK's attempt to open an X display first
+        os.environ.setdefault('VTK_DEFAULT_OPENGL_WINDOW', 'vtkEGLRenderWindow')
+    import pyvista as pv
+    pv.OFF_SCREEN = True
+
+
+def render_thumbnail(stl_path: str, png_path: str = None, size=THUMBNAIL_SIZE) -> Path:
+    """Save an isometric view of a result as a PNG and return its path."""
+    import pyvista as pv
+    from volcogui.backend.scene import read_result_mesh, show_result_mesh
+
+    png_path = Path(png_path) if png_path else thumbnail_path(stl_path)
+    mesh = read_result_mesh(stl_path)
+    plotter = pv.Plotter(off_screen=True, window_size=list(size))
+    try:
+        plotter.set_background('white')
+        show_result_mesh(plotter, mesh)
+        tmp = png_path.with_name(png_path.name + '.tmp.png')
+        plotter.screenshot(str(tmp))
+        os.replace(tmp, png_path)
+    finally:
+        plotter.close()
+    return png_path
+
+
+def result_stats(stl_path: str) -> dict:
+    """Mesh and voxel grid figures shown in a report."""
+    from volcogui.backend.scene import read_result_mesh
+
+    mesh = read_result_mesh(stl_path)
+    x0, x1, y0, y1, z0, z1 = mesh.bounds
+    stats = {
+        'Triangles': f"{mesh.n_cells:,}",
+        'Size': f"{x1 - x0:.2f} × {y1 - y0:.2f} × {z1 - z0:.2f} mm",
+        'Volume': f"{mesh.volume:.2f} mm³",
+        'Surface area': f"{mesh.area:.2f} mm²",
+    }
+    loaded = load_voxel_grid(stl_path, mmap=True)
+    if loaded is not None:
+        grid, voxel_size = loaded
+        # The middle layer is one contiguous block of the Fortran-order grid
+        middle = grid[:, :, grid.shape[2] // 2]
+        stats['Voxel grid'] = (f"{' × '.join(str(n) for n in grid.shape)} at {voxel_size} mm "
+                               f"({format_bytes(grid.nbytes)})")
+        stats['Middle layer filled'] = f"{fill_fraction(middle):.0%}"
+    return stats
+
+
+def _table(rows: dict) -> str:
+    cells = "".join(
+        f"<tr><th>{html.escape(str(key))}</th><td>{html.escape(str(value))}</td></tr>"
+        for key, value in rows.items()
+    )
+    return f"<table>{cells}</table>"
+
+
+STYLE = """
+body { font-family: sans-serif; margin: 1.5em; color: #222; }
+h1 { font-size: 1.3em; }
+h2 { font-size: 1.05em; margin-top: 1.5em; }
+table { border-collapse: collapse; font-size: 0.9em; }
+th { text-align: left; padding: 2px 12px 2px 0; color: #555; font-weight: normal; }
+td { padding: 2px 0; }
+.sheet { display: flex; flex-wrap: wrap; gap: 12px; }
+.card { width: 200px; font-size: 0.8em; text-align: center; }
+.card img { width: 200px; border: 1px solid #ddd; }
+.card a { color: #222; text-decoration: none; }
+"""
+
+
+def _page(title: str, body: str) -> str:
+    return (
+        f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>{html.escape(title)}</title>"
+        f"<style>{STYLE}</style></head>\n<body>\n{body}\n</body></html>\n"
+    )
+
+
+def write_report(stl_path: str, gcode_path: str = None, params: dict = None) -> Path:
+    """Render the thumbnail and write the HTML report next to the STL."""
+    stl_path = Path(stl_path)
+    thumbnail = render_thumbnail(str(stl_path))
+    info = {'Result': stl_path.name}
+    if gcode_path:
+        info['G-code'] = Path(gcode_path).name
+    info['Generated'] = time.strftime('%Y-%m-%d %H:%M')
+    body = (
+        f"<h1>{html.escape(stl_path.name)}</h1>\n"
+        f"<img src=\"{html.escape(thumbnail.name)}\" alt=\"Isometric view\">\n"
+        f"{_table(info)}\n<h2>Result</h2>\n{_table(result_stats(str(stl_path)))}\n"
+    )
+    if params:
+        shown = {key: value for key, value in sorted(params.items()) if key not in HIDDEN_PARAMS}
+        body += f"<h2>Parameters</h2>\n{_table(shown)}\n"
+    target = report_path(stl_path)
+    tmp = target.with_name(target.name + '.tmp')
+    tmp.write_text(_page(stl_path.name, body), encoding='utf-8')
+    os.replace(tmp, target)
+    return target
+
+
+def write_contact_sheet(folder: str) -> Path:
+    """Write the folder's contact sheet: a thumbnail grid of every report, newest first."""
+    folder = Path(folder)
+    results = [stl for stl in folder.glob('*.stl')
+               if report_path(stl).exists() and thumbnail_path(stl).exists()]
+    results.sort(key=lambda stl: report_path(stl).stat().st_mtime, reverse=True)
+    cards = "".join(
+        f"<div class=\"card\"><a href=\"{html.escape(report_path(stl).name)}\">"
+        f"<img src=\"{html.escape(thumbnail_path(stl).name)}\" loading=\"lazy\"><br>"
+        f"{html.escape(stl.name)}</a></div>\n"
+        for stl in results
+    )
+    title = f"Results in {folder.resolve().name}"
+    body = f"<h1>{html.escape(title)}</h1>\n<p>{len(results)} result(s)</p>\n<div class=\"sheet\">\n{cards}</div>"
+    target = folder / CONTACT_SHEET
+    tmp = target.with_name(target.name + '.tmp')
+    tmp.write_text(_page(title, body), encoding='utf-8')
+    os.replace(tmp, target)
+    return target
+
+
+class ReportPool:
+    """Renders reports in spawned worker processes and keeps contact sheets current.
+
+    submit() returns a Future of the report path; the folder's contact
+    sheet is rewritten when a report is done.
+    """
+
+    def __init__(self, workers: int = 1):
+        self._executor = spawn_executor(workers, initializer=_init_renderer)
+        self._lock = threading.Lock()
+
+    def submit(self, stl_path: str, gcode_path: str = None, params: dict = None):
+        future = self._executor.submit(write_report, str(stl_path), gcode_path, params)
+        future.add_done_callback(lambda f: self._update_sheet(f, Path(stl_path).parent))
+        return future
+
+    def _update_sheet(self, future, folder: Path):
+        if future.cancelled() or future.exception() is not None:
+            return
+        # Done callbacks run on the pool's thread; keep sheet writes one at a time
+        with self._lock:
+            write_contact_sheet(str(folder))
+
+    def shutdown(self, wait: bool = False):
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+def main():
+    """Render reports for result STLs from the command line."""
+    parser = argparse.ArgumentParser(description="Render thumbnails and HTML reports for results")
+    parser.add_argument('paths', nargs='+', help="Result STLs or folders of them")
+    parser.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 1),
+                        help="Rendering processes")
+    args = parser.parse_args()
+
+    stls = []
+    for path in map(Path, args.paths):
+        stls += sorted(path.glob('*.stl')) if path.is_dir() else [path]
+    pool = ReportPool(args.workers)
+    futures = {pool.submit(str(stl)): stl for stl in stls}
+    failed = 0
+    for future, stl in futures.items():
+        try:
+            print(f"[report] {future.result()}", flush=True)
+        except Exception as e:
+            failed += 1
+            print(f"[error] {stl}: {e}", flush=True)
+    pool.shutdown(wait=True)
+    for folder in sorted({stl.parent for stl in stls}):
+        print(f"[contact sheet] {write_contact_sheet(str(folder))}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    raise SystemExit(main())
@@ -0,0 +1,229 @@
+"""Memory and CPU sampling of simulation processes, with a memory budget.
+
+Volco keeps the whole voxel space in memory, so a fine voxel size on a
+large part can exhaust RAM. The voxel space size is estimated from the
+G-code before simulating, and the simulation process's resident memory
+and CPU use are sampled while it runs, so a job that would exceed the
+budget is stopped with a clear message instead of by the OOM killer.
+
+psutil is used when installed; otherwise /proc is read (Linux only).
+"""
+
+import os
+import time
+from typing import Optional
+
+import numpy as np
+
+from volcogui.backend.gcode import GCODE_ENCODING, iter_moves
+from volcogui.backend.region import region_bounds
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+# Bytes per voxel in the estimate: NumPy's default float64, so the estimate
+# errs high if Volco stores a smaller type
+VOXEL_BYTES = 8
+
+
+class MemoryBudgetError(RuntimeError):
+    """Raised when a simulation would exceed or has exceeded its memory budget."""
+
+
+def format_bytes(count: float) -> str:
+    if count < 1024:
+        return f"{count:.0f} B"
+    for unit in ('KB', 'MB'):
+        count /= 1024
+        if count < 1024:
+            return f"{count:.1f} {unit}"
+    return f"{count / 1024:.1f} GB"
+
+
+def memory_budget(params: dict) -> Optional[int]:
+    """The memory budget in bytes, or None if unlimited."""
+    budget = params.get('memory_budget_gb') or 0
+    return int(budget * 1024 ** 3) if budget > 0 else None
+
+
+def estimate_voxel_bytes(gcode_path: str, params: dict) -> int:
+    """Size of Volco's voxel space for this G-code: the filaments' extent
+    (clipped to the region of interest) plus the offsets Volco pads on each side.
+
+    The file is streamed, so estimating a large G-code takes little memory.
+    """
+    # Deferred: simulation_runner imports this module
+    from volcogui.backend.simulation_runner import build_volco_configs
+
+    # One streaming pass: only the running bounds are kept, not the moves
+    lower = [np.inf] * 3
+    upper = [-np.inf] * 3
+    with open(gcode_path, encoding=GCODE_ENCODING) as f:
+        for _, _, move in iter_moves(f):
+            # Filaments only, as extrusion_mask(): extruding moves that travel
+            if move is None or move[4] <= 0 or move[1] == move[2]:
+                continue
+            lower = list(map(min, lower, move[1], move[2]))
+            upper = list(map(max, upper, move[1], move[2]))
+    if lower[0] == np.inf:
+        return 0
+    lower, upper = np.array(lower), np.array(upper)
+    region = params.get('region')
+    if region:
+        region_lower, region_upper = region_bounds(region)
+        lower = np.maximum(lower, region_lower)
+        upper = np.minimum(upper, region_upper)
+    _, sim_config = build_volco_configs(params, '')
+    offsets = np.array([sim_config['x_offset'], sim_config['y_offset'], sim_config['z_offset']])
+    extent = np.maximum(upper - lower, 0) + 2 * offsets
+    voxels = np.prod(np.ceil(extent / params['voxel_size']) + 1)
+    return int(voxels * VOXEL_BYTES)
+
+
+def check_voxel_budget(gcode_path: str, params: dict, voxel_bytes: int = None) -> int:
+    """Estimate the voxel space and raise MemoryBudgetError if it cannot fit the budget.
+
+    Pass voxel_bytes to check an estimate made earlier instead of parsing again.
+    """
+    if voxel_bytes is None:
+        voxel_bytes = estimate_voxel_bytes(gcode_path, params)
+    budget = memory_budget(params)
+    if budget is not None and voxel_bytes > budget:
+        raise MemoryBudgetError(
+            f"The voxel space alone needs about {format_bytes(voxel_bytes)}, more than the "
+            f"memory budget of {format_bytes(budget)}.\n\nIncrease the voxel size, simulate "
+            f"a region of interest or raise the budget."
+        )
+    return voxel_bytes
+
+
+def _proc_rss(pid: int) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _proc_peak_rss(pid: int) -> Optional[int]:
+    """The kernel's resident memory high-water mark (VmHWM), which catches
+    spikes between samples."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _proc_cpu_time(pid: int) -> Optional[float]:
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # The command name may contain spaces; fields resume after ')'
+            fields = f.read().rsplit(')', 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class ResourceMonitor:
+    """Samples a process's resident memory and CPU use and keeps the peaks.
+
+    cpu_percent is relative to one core, so a multi-threaded process can
+    exceed 100%. Values are None where the platform cannot be sampled.
+    voxel_bytes starts as the G-code estimate; the simulation reports the
+    real size through set_voxel_bytes() once its voxel space exists.
+    """
+
+    def __init__(self, pid: int = None, voxel_bytes: int = None, budget: int = None):
+        self.pid = pid or os.getpid()
+        self.voxel_bytes = voxel_bytes
+        self.voxel_bytes_measured = False
+        self.budget = budget
+        self.rss = None
+        self.cpu_percent = None
+        self.peak_rss = None
+        self.peak_cpu_percent = None
+        self._process = None
+        if PSUTIL_AVAILABLE:
+            try:
+                self._process = psutil.Process(self.pid)
+            except psutil.Error:
+                pass
+        self._last = (time.monotonic(), self._cpu_time())
+
+    def _cpu_time(self) -> Optional[float]:
+        if self._process is not None:
+            try:
+                times = self._process.cpu_times()
+                return times.user + times.system
+            except psutil.Error:
+                return None
+        return _proc_cpu_time(self.pid)
+
+    def _rss(self) -> Optional[int]:
+        if self._process is not None:
+            try:
+                return self._process.memory_info().rss
+            except psutil.Error:
+                return None
+        return _proc_rss(self.pid)
+
+    def sample(self):
+        """Take a sample and update the peaks."""
+        now, cpu_time = time.monotonic(), self._cpu_time()
+        last_time, last_cpu_time = self._last
+        if cpu_time is not None and last_cpu_time is not None and now > last_time:
+            self.cpu_percent = 100.0 * (cpu_time - last_cpu_time) / (now - last_time)
+            self.peak_cpu_percent = max(self.peak_cpu_percent or 0.0, self.cpu_percent)
+        self._last = (now, cpu_time)
+        self.rss = self._rss()
+        if self.rss is not None:
+            self.peak_rss = max(self.peak_rss or 0, self.rss, _proc_peak_rss(self.pid) or 0)
+
+    def set_voxel_bytes(self, count: int):
+        """Record the size of the simulation's actual voxel array."""
+        self.voxel_bytes = count
+        self.voxel_bytes_measured = True
+
+    def _voxels(self) -> str:
+        return f"{'' if self.voxel_bytes_measured else '~'}{format_bytes(self.voxel_bytes)}"
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.rss is not None and self.rss > self.budget
+
+    def status(self) -> str:
+        """Current values with peaks, for progress messages."""
+        parts = []
+        if self.rss is not None:
+            parts.append(f"RAM {format_bytes(self.rss)} (peak {format_bytes(self.peak_rss)})")
+        if self.cpu_percent is not None:
+            parts.append(f"CPU {self.cpu_percent:.0f}% (peak {self.peak_cpu_percent:.0f}%)")
+        if self.voxel_bytes:
+            parts.append(f"voxels {self._voxels()}")
+        return ", ".join(parts)
+
+    def summary(self) -> str:
+        """Peak values, for the final report."""
+        parts = []
+        if self.peak_rss is not None:
+            parts.append(f"peak RAM {format_bytes(self.peak_rss)}")
+        if self.peak_cpu_percent is not None:
+            parts.append(f"peak CPU {self.peak_cpu_percent:.0f}%")
+        if self.voxel_bytes:
+            parts.append(f"voxel space {self._voxels()}")
+        return ", ".join(parts)
+
+    def budget_message(self) -> str:
+        return (
+            f"Simulation stopped: memory use reached {format_bytes(self.rss)}, over the "
+            f"budget of {format_bytes(self.budget)}.\n\nIncrease the voxel size, simulate "
+            f"a region of interest or raise the budget."
+        )
@@ -0,0 +1,32 @@
+"""PyVista scene setup shared by the 3D viewer and offscreen rendering."""
+
+import pyvista as pv
+
+from volcogui.backend.mesh_io import load_indexed_mesh
+
+
+RESULT_MESH_STYLE = {
+    'color': 'lightblue',
+    'show_edges': True,
+    'edge_color': 'gray',
+    'opacity': 0.9,
+}
+
+
+def read_result_mesh(stl_path: str) -> pv.PolyData:
+    """Read a mesh, using the welded NumPy cache when possible."""
+    indexed = load_indexed_mesh(stl_path)
+    if indexed is None:
+        # ASCII STL - let VTK parse it
+        return pv.read(stl_path)
+    vertices, faces = indexed
+    return pv.PolyData.from_regular_faces(vertices, faces)
+
+
+def show_result_mesh(plotter, mesh, reset_camera: bool = True):
+    """Add a simulated part to a cleared plotter, viewed isometrically."""
+    plotter.add_mesh(mesh, **RESULT_MESH_STYLE)
+    if reset_camera:
+        plotter.reset_camera()
+        plotter.view_isometric()
+    plotter.show_axes()
@@ -0,0 +1,193 @@
+"""Merging of collinear micro-segments before simulation.
+
+Slicers often emit straight walls and infill lines as many tiny G1 moves.
+Volco deposits every move as its own filament with at least one step, so
+these micro-segments cost time without adding detail, and zero-length
+moves can divide by zero. The G-code is streamed line by line and runs of
+consecutive extrusion moves that lie within a tolerance of one straight
+line are written as a single move carrying their total extrusion.
+"""
+
+import math
+
+from volcogui.backend.gcode import GCODE_ENCODING, iter_moves, format_move, parse_words
+
+
+DEFAULT_TOLERANCE = 0.01        # mm a merged-away vertex may lie off the new line
+DEFAULT_FLOW_TOLERANCE = 0.05   # Relative spread of extrusion per mm within a merged run
+MAX_RUN = 256                   # Moves merged at most into one (bounds the per-run check)
+
+
+def _sub(a, b):
+    return (a[0] - b[0], a[1] - b[1], a[2] - b[2])
+
+
+def _dot(a, b):
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+def _deposition_steps(length: float, step_size: float) -> int:
+    """Steps Volco takes along a filament (at least one), as in step_extrusions."""
+    return max(int(round(length / step_size)), 1)
+
+
+class _Run:
+    """Consecutive extrusion moves that may still be merged into one."""
+
+    def __init__(self, move, line, has_feed: bool, step_size: float):
+        self.first = move
+        self.step_size = step_size
+        self.start = tuple(move[1])
+        self.end = tuple(move[1])
+        self.e = 0.0
+        self.feed = move[5]
+        self.feed_word = False
+        self.vertices = []      # Intermediate points that must stay near the chord
+        self.flows = []         # Extrusion per mm of each filament
+        self.lines = []         # Original text, written back if nothing was merged
+        self.steps = 0          # Deposition steps of the original filaments
+        self.add(move, line, has_feed)
+
+    def accepts(self, move, tolerance: float, flow_tolerance: float) -> bool:
+        """Whether the move can join the run without leaving the tolerance."""
+        if len(self.lines) >= MAX_RUN or move[5] != self.feed or move[6:] != self.first[6:]:
+            return False
+        end = tuple(move[2])
+        chord = _sub(end, self.start)
+        chord_length = math.sqrt(_dot(chord, chord))
+        if chord_length == 0:
+            return end == tuple(move[1])
+        if _dot(_sub(end, move[1]), chord) < 0:
+            # Doubling back on itself
+            return False
+        for point in self.vertices + [self.end]:
+            offset = _sub(point, self.start)
+            along = _dot(offset, chord) / chord_length
+            if along < 0 or along > chord_length:
+                return False
+            if _dot(offset, offset) - along * along > tolerance * tolerance:
+                return False
+        length = math.dist(move[1], move[2])
+        if length > 0 and self.flows:
+            flows = self.flows + [move[4] / length]
+            if max(flows) - min(flows) > flow_tolerance * sum(flows) / len(flows):
+                return False
+        return True
+
+    def add(self, move, line, has_feed: bool):
+        end = tuple(move[2])
+        if end != self.end:
+            if self.end != self.start:
+                self.vertices.append(self.end)
+            self.end = end
+        length = math.dist(move[1], move[2])
+        if length > 0:
+            self.flows.append(move[4] / length)
+            self.steps += _deposition_steps(length, self.step_size)
+        self.e += move[4]
+        self.feed_word = self.feed_word or has_feed
+        self.lines.append(line)
+
+    @property
+    def merged(self) -> bool:
+        return len(self.lines) > 1 and self.end != self.start
+
+    def write(self, f, stats: dict):
+        """Write the run, merged if that changes anything, and count what was written."""
+        modes = {'abs_xyz': self.first[6], 'abs_e': self.first[7]}
+        feed = self.feed if self.feed_word else None
+        if self.end == self.start:
+            # Only zero-length extrusion: one E-only move keeps the volume (and
+            # the E axis) without a degenerate filament for Volco
+            f.write(format_move(modes, self.start, self.end, self.first[3], self.e, feed) + '\n')
+            stats['dropped_moves'] += len(self.lines) - 1
+            return
+        if not self.merged:
+            # A single move: keep it as it was
+            f.write('\n'.join(self.lines) + '\n')
+            stats['output_filaments'] += len(self.flows)
+            stats['output_steps'] += self.steps
+            return
+        f.write(format_move(modes, self.start, self.end, self.first[3], self.e, feed) + '\n')
+        stats['output_filaments'] += 1
+        stats['output_steps'] += _deposition_steps(math.dist(self.start, self.end), self.step_size)
+        stats['dropped_moves'] += len(self.lines) - len(self.flows)
+
+
+def _is_comment(line: str) -> bool:
+    stripped = line.strip()
+    return not stripped or stripped.startswith(';')
+
+
+def simplify_gcode(gcode_path: str, output_path: str, step_size: float,
+                   tolerance: float = DEFAULT_TOLERANCE,
+                   flow_tolerance: float = DEFAULT_FLOW_TOLERANCE) -> dict:
+    """Write a copy of the G-code with collinear extrusion moves merged.
+
+    Consecutive extrusion moves with the same feed rate and positioning modes
+    are merged while every intermediate vertex stays within tolerance (mm)
+    of the merged line and their extrusion per mm agrees within
+    flow_tolerance, so the total extruded volume is unchanged. Extrusion
+    moves that do not move the nozzle are folded into their neighbours, or
+    become E-only moves where there is none, and moves that change nothing
+    are dropped. Travel, retraction and every
+    other command pass through unchanged.
+
+    Returns filament and deposition step counts before and after.
+    """
+    stats = {
+        'filaments': 0,
+        'output_filaments': 0,
+        'dropped_moves': 0,
+        'steps': 0,
+        'output_steps': 0,
+    }
+    run = None
+    comments = []
+
+    def flush(f):
+        nonlocal run, comments
+        if run is not None:
+            run.write(f, stats)
+            run = None
+        if comments:
+            f.write('\n'.join(comments) + '\n')
+            comments = []
+
+    with open(gcode_path, encoding=GCODE_ENCODING) as source, \
+            open(output_path, 'w', encoding=GCODE_ENCODING) as f:
+        f.write(f"; volcogui simplified G-code (tolerance {tolerance} mm)\n")
+        for _, line, move in iter_moves(source):
+            if move is None:
+                if run is not None and _is_comment(line):
+                    # Comments do not end a run; write them after it
+                    comments.append(line)
+                    continue
+                flush(f)
+                f.write(line + '\n')
+                continue
+
+            length = math.dist(move[1], move[2])
+            words = parse_words(line)
+            if length == 0 and move[4] == 0 and 'F' not in words:
+                # Changes nothing
+                stats['dropped_moves'] += 1
+                continue
+            if move[4] > 0 and length > 0:
+                stats['filaments'] += 1
+                stats['steps'] += _deposition_steps(length, step_size)
+            # Zero-length extrusion with coordinates is a degenerate filament;
+            # an E-only move is a retraction or prime and stays as it is
+            if move[4] <= 0 or not any(letter in words for letter in 'XYZ'):
+                flush(f)
+                f.write(line + '\n')
+                continue
+            if run is not None and run.accepts(move, tolerance, flow_tolerance):
+                run.add(move, line, 'F' in words)
+                continue
+            flush(f)
+            run = _Run(move, line, 'F' in words, step_size)
+        flush(f)
+
+    stats['merged_moves'] = stats['filaments'] - stats['output_filaments']
+    return stats
@@ -0,0 +1,139 @@
+"""HTTP client for the VolcoGUI simulation server."""
+
+import base64
+import gzip
+import http.client
+import json
+import zlib
+from pathlib import Path
+from typing import Iterator, Tuple
+
+
+DEFAULT_PORT = 8765
+
+
+class RemoteSimulationError(Exception):
+    """Raised when the simulation server rejects a request or a job fails."""
+
+
+def parse_address(address: str) -> Tuple[str, int]:
+    """Split 'host[:port]' (optionally with an http:// prefix) into host and port."""
+    address = address.strip()
+    if address.startswith('http://'):
+        address = address[len('http://'):]
+    address = address.rstrip('/')
+    host, _, port = address.rpartition(':')
+    if not host:
+        return port, DEFAULT_PORT
+    return host, int(port)
+
+
+class SimulationClient:
+    """Thin client for submitting and following jobs on a simulation server."""
+
+    def __init__(self, address: str, timeout: float = 30.0):
+        self.host, self.port = parse_address(address)
+        self.timeout = timeout
+
+    def _connect(self) -> http.client.HTTPConnection:
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _request(self, method: str, path: str, body: bytes = None, headers: dict = None) -> dict:
+        """Send a request and decode its JSON reply."""
+        conn = self._connect()
+        try:
+            conn.request(method, path, body=body, headers=headers or {})
+            response = conn.getresponse()
+            data = response.read()
+            if response.status >= 400:
+                raise RemoteSimulationError(self._error_message(response.status, data))
+            return json.loads(data) if data else {}
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _error_message(status: int, data: bytes) -> str:
+        try:
+            return json.loads(data)['error']
+        except (ValueError, KeyError):
+            return f"Server returned HTTP {status}"
+
+    def submit(self, gcode_path: str, params: dict) -> str:
+        """Upload a G-code file with its parameters and return the job id.
+
+        The file is sent as raw bytes (base64), so G-code in any encoding
+        arrives byte-for-byte as it would be read locally.
+        """
+        payload = {
+            'name': Path(gcode_path).name,
+            'gcode_base64': base64.b64encode(Path(gcode_path).read_bytes()).decode('ascii'),
+            'params': params,
+        }
+        body = gzip.compress(json.dumps(payload).encode('utf-8'))
+        reply = self._request('POST', '/jobs', body, {
+            'Content-Type': 'application/json',
+            'Content-Encoding': 'gzip',
+        })
+        return reply['job_id']
+
+    def status(self, job_id: str) -> dict:
+        """Get the current state of a job."""
+        return self._request('GET', f'/jobs/{job_id}')
+
+    def stream_events(self, job_id: str) -> Iterator[dict]:
+        """Yield progress events for a job until it finishes, fails or is cancelled.
+
+        Each event is a dict with 'type' and 'message'. Server heartbeats are
+        swallowed so callers only see real events.
+        """
+        conn = self._connect()
+        try:
+            conn.request('GET', f'/jobs/{job_id}/events')
+            response = conn.getresponse()
+            if response.status >= 400:
+                raise RemoteSimulationError(self._error_message(response.status, response.read()))
+            for line in response:
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                if event['type'] == 'heartbeat':
+                    continue
+                yield event
+                if event['type'] in ('finished', 'error', 'cancelled'):
+                    return
+            raise RemoteSimulationError("Connection to simulation server closed unexpectedly")
+        finally:
+            conn.close()
+
+    def cancel(self, job_id: str):
+        """Cancel a queued or running job."""
+        self._request('POST', f'/jobs/{job_id}/cancel')
+
+    def fetch_result(self, job_id: str, output_path: str, resource: str = 'result',
+                     chunk_size: int = 1 << 20):
+        """Download a finished job's STL ('result') or voxel grid ('voxels').
+
+        The zlib stream is decompressed to disk as it arrives.
+        """
+        conn = self._connect()
+        try:
+            conn.request('GET', f'/jobs/{job_id}/{resource}')
+            response = conn.getresponse()
+            if response.status >= 400:
+                raise RemoteSimulationError(self._error_message(response.status, response.read()))
+            decompressor = zlib.decompressobj()
+            with open(output_path, 'wb') as f:
+                while True:
+                    chunk = response.read(chunk_size)
+                    if not chunk:
+                        break
+                    f.write(decompressor.decompress(chunk))
+                f.write(decompressor.flush())
+            if not decompressor.eof:
+                raise RemoteSimulationError("Result download was truncated")
+        finally:
+            conn.close()
+
+    def delete(self, job_id: str):
+        """Remove a job and its files from the server."""
+        self._request('DELETE', f'/jobs/{job_id}')
@@ -1,15 +1,35 @@
 """Simulation runner for Volco."""
 
+import os
 import sys
 import io
 import re
+import queue
 import shutil
+import multiprocessing
 import tempfile
 import threading
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Optional
 from PyQt6.QtCore import QThread, pyqtSignal
 
+from volcogui.backend.mesh_io import write_sidecar
+from volcogui.backend.mesh_postprocess import run_postprocess, postprocess_mesh_file
+from volcogui.backend.simulation_client import SimulationClient, RemoteSimulationError
+from volcogui.backend.speed_profiles import write_acceleration_gcode
+from volcogui.backend.simplify import simplify_gcode, DEFAULT_TOLERANCE
+from volcogui.backend.region import write_region_gcode
+from volcogui.backend.checkpoint import (
+    DEFAULT_INTERVAL, checkpoint_dir, checkpoint_key, deposition_checkpoints,
+)
+from volcogui.backend.resources import (
+    ResourceMonitor, MemoryBudgetError, memory_budget, check_voxel_budget,
+)
+from volcogui.backend.voxel_io import (
+    save_voxel_grid, copy_voxel_grid, move_voxel_grid, download_path, install_download,
+)
+
 
 class ProgressCapture(io.StringIO):
     """Custom StringIO that captures output and triggers callbacks."""
@@ -51,6 +71,314 @@ class ProgressCapture(io.StringIO):
                 pass
 
 
+def find_volco() -> bool:
+    """Locate Volco and add it to sys.path. Returns False if it cannot be found."""
+    # Try to find Volco in multiple locations
+    volco_paths = [
+        # For PyInstaller bundled version
+        Path(sys._MEIPASS) / "volco" if hasattr(sys, '_MEIPASS') else None,
+        # Development: sibling to volcogui
+        Path(__file__).parent.parent.parent.parent / "volco",
+        # Common development location
+        Path.home() / "projects" / "gcode" / "volco",
+    ]
+    
+    # Filter out None paths
+    volco_paths = [p for p in volco_paths if p is not None]
+    
+    for volco_path in volco_paths:
+        if volco_path.exists() and (volco_path / "volco.py").exists():
+            if str(volco_path) not in sys.path:
+                sys.path.insert(0, str(volco_path))
+            return True
+    return False
+
+
+def build_volco_configs(params: dict, results_folder: str):
+    """Build Volco's printer and simulation config dicts from GUI parameters."""
+    printer_config = {
+        'nozzle_diameter': params['nozzle_diameter'],
+        'feedstock_filament_diameter': 1.75,
+        'nozzle_jerk_speed': params.get('nozzle_jerk_speed', 10.0),
+        'extruder_jerk_speed': params.get('extruder_jerk_speed', 5.0),
+        'nozzle_acceleration': params.get('nozzle_acceleration', 1000.0),
+        'extruder_acceleration': params.get('extruder_acceleration', 5000.0),
+    }
+    sim_config = {
+        'simulation_name': 'volcogui_simulation',
+        'results_folder': results_folder,
+        'voxel_size': params['voxel_size'],
+        'step_size': params['step_size'],
+        'x_offset': 5 * params['nozzle_diameter'],
+        'y_offset': 5 * params['nozzle_diameter'],
+        'z_offset': 5 * params['nozzle_diameter'],
+        'sphere_z_offset': 0.5 * params['nozzle_diameter'],
+        'x_crop': ['all', 'all'],
+        'y_crop': ['all', 'all'],
+        'z_crop': ['all', 'all'],
+        'radius_increment': 0.001,
+        'solver_tolerance': 0.0001,
+        # Acceleration is baked into the G-code by speed_profiles instead,
+        # which avoids Volco's per-filament Python profile computation
+        'consider_acceleration': False,
+        'stl_ascii': False,
+    }
+    return printer_config, sim_config
+
+
+def run_volco_simulation(gcode_path: str, params: dict, results_folder: str,
+                         output_callback, status_callback, voxels_callback=None) -> Path:
+    """Run Volco with stdout/logging captured and export the result STL.
+    
+    Volco must be importable (see find_volco). output_callback receives raw
+    Volco output, status_callback receives human-readable stage messages and
+    voxels_callback, if given, the size in bytes of Volco's voxel array once
+    it is allocated. Returns the path of the STL written by Volco.
+    """
+    # Set up logging capture BEFORE importing volco
+    # This is critical because volco configures logging at module import time
+    import logging
+    
+    # Capture both stdout and stderr with progress tracking
+    old_stdout = sys.stdout
+    old_stderr = sys.stderr
+    captured_output = ProgressCapture(output_callback, old_stderr)
+    sys.stdout = captured_output
+    sys.stderr = captured_output
+    
+    try:
+        # Pre-configure logging BEFORE volco import
+        root_logger = logging.getLogger()
+        # Clear any existing handlers
+        root_logger.handlers.clear()
+        # Add our custom handler
+        new_handler = logging.StreamHandler(captured_output)
+        new_handler.setFormatter(logging.Formatter("%(levelname)s %(asctime)s %(message)s"))
+        root_logger.addHandler(new_handler)
+        root_logger.setLevel(logging.INFO)
+        
+        # Monkey-patch basicConfig to prevent volco from overriding our setup
+        original_basicConfig = logging.basicConfig
+        logging.basicConfig = lambda *args, **kwargs: None
+        
+        try:
+            # NOW import volco - our logging will be used
+            from volco import run_simulation
+        finally:
+            # Restore basicConfig (just in case)
+            logging.basicConfig = original_basicConfig
+        
+        status_callback("Parsing G-code...")
+        printer_config, sim_config = build_volco_configs(params, results_folder)
+        
+        budget = memory_budget(params)
+        snapshot_copies = True
+        if budget is not None:
+            # Refuse up front rather than allocate a voxel space that cannot fit
+            # SimulationWorker passes its estimate along, so the G-code is parsed once
+            voxel_bytes = check_voxel_budget(gcode_path, params, params.get('voxel_bytes'))
+            # A background checkpoint holds a second copy of the voxel space
+            snapshot_copies = 2 * voxel_bytes <= budget
+        
+        # Keyed on the original G-code: the rewrites below follow from the parameters
+        checkpoints = nullcontext()
+        checkpoint_directory = None
+        interval = params.get('checkpoint_interval', DEFAULT_INTERVAL)
+        if params.get('checkpoint_dir') and interval > 0:
+            checkpoint_directory = checkpoint_dir(params['checkpoint_dir'],
+                                                  checkpoint_key(gcode_path, params))
+            if not snapshot_copies:
+                status_callback("Checkpoints pause deposition while writing to stay within the memory budget")
+        if checkpoint_directory is not None or voxels_callback is not None:
+            # One hook on Volco's deposition loop does both
+            checkpoints = deposition_checkpoints(checkpoint_directory, params.get('resume', False),
+                                                 interval, status_callback, snapshot_copies,
+                                                 voxels_callback)
+        
+        if params.get('simplify_gcode'):
+            # Before the acceleration split, which deliberately adds sub-moves
+            status_callback("Merging collinear segments...")
+            Path(results_folder).mkdir(parents=True, exist_ok=True)
+            simplified_gcode = Path(results_folder) / "simplified.gcode"
+            stats = simplify_gcode(
+                gcode_path, str(simplified_gcode), params['step_size'],
+                params.get('simplify_tolerance', DEFAULT_TOLERANCE),
+            )
+            status_callback(
+                f"Simplified G-code: {stats['filaments']} → {stats['output_filaments']} filaments, "
+                f"{stats['steps']} → {stats['output_steps']} deposition steps "
+                f"(~{stats['filaments'] / max(stats['output_filaments'], 1):.1f}x fewer filaments, "
+                f"{stats['dropped_moves']} zero-length moves dropped)"
+            )
+            gcode_path = str(simplified_gcode)
+        
+        if params.get('consider_acceleration'):
+            status_callback("Computing acceleration profiles...")
+            Path(results_folder).mkdir(parents=True, exist_ok=True)
+            profiled_gcode = Path(results_folder) / "acceleration_profiled.gcode"
+            stats = write_acceleration_gcode(
+                gcode_path, str(profiled_gcode), printer_config, params['step_size'],
+            )
+            status_callback(
+                f"Acceleration profiles: {stats['split_filaments']} of "
+                f"{stats['filaments']} filaments split into sub-moves"
+            )
+            gcode_path = str(profiled_gcode)
+        
+        region = params.get('region')
+        if region:
+            # Volco sizes the voxel space from what is left to extrude
+            status_callback("Cropping G-code to region of interest...")
+            Path(results_folder).mkdir(parents=True, exist_ok=True)
+            region_gcode = Path(results_folder) / "region_of_interest.gcode"
+            stats = write_region_gcode(gcode_path, str(region_gcode), region)
+            if stats['kept'] == 0:
+                raise ValueError("No filaments lie inside the region of interest")
+            status_callback(
+                f"Region of interest: kept {stats['kept']} of {stats['filaments']} "
+                f"filaments ({stats['clipped']} clipped)"
+            )
+            gcode_path = str(region_gcode)
+        
+        status_callback("Running voxel simulation...")
+        with checkpoints:
+            output = run_simulation(
+                gcode_path=gcode_path,
+                printer_config=printer_config,
+                sim_config=sim_config,
+            )
+        if checkpoint_directory is not None:
+            # Finished, nothing left to resume
+            shutil.rmtree(checkpoint_directory, ignore_errors=True)
+        
+        status_callback("Generating mesh...")
+        
+        # Export STL (Volco creates the file in results_folder/simulation_name.stl)
+        output.export_mesh_to_stl()
+        
+    finally:
+        # Restore stdout and stderr
+        sys.stdout = old_stdout
+        sys.stderr = old_stderr
+        output_text = captured_output.getvalue()
+        
+        # Extract progress info for debugging
+        if "Number of printed filaments:" in output_text:
+            match = re.search(r'Number of printed filaments: (\d+)', output_text)
+            if match:
+                total_filaments = match.group(1)
+                status_callback(f"Processed {total_filaments} filaments")
+    
+    # Get the actual STL path that Volco created
+    actual_stl_path = Path(results_folder) / f"{sim_config['simulation_name']}.stl"
+    if not actual_stl_path.exists():
+        raise FileNotFoundError(f"STL file not found at {actual_stl_path}")
+    
+    # Keep the voxel grid for FEA and slice views
+    grid = getattr(output, 'cropped_voxel_space', None)
+    if grid is not None:
+        save_voxel_grid(str(actual_stl_path), grid, params['voxel_size'])
+    return actual_stl_path
+
+
+def finalize_mesh(stl_path: str, params: dict, status_callback, in_process: bool = False):
+    """Post-process (if enabled) and index a result STL for the viewer.
+    
+    in_process runs post-processing in the calling process, for callers that
+    already are a worker process.
+    """
+    postprocess = params.get('postprocess')
+    if postprocess and postprocess.get('enabled'):
+        # Weld/smooth/decimate; also rewrites the sidecar
+        status_callback("Post-processing mesh...")
+        if in_process:
+            stats = postprocess_mesh_file(stl_path, postprocess)
+        else:
+            stats = run_postprocess(stl_path, postprocess)
+        status_callback(
+            f"Post-processed mesh: {stats['input_triangles']:,} → "
+            f"{stats['output_triangles']:,} triangles"
+        )
+    else:
+        # Cache a welded copy so the viewer skips STL parsing
+        status_callback("Indexing mesh...")
+        write_sidecar(stl_path)
+
+
+def run_simulation_job(gcode_path: str, params: dict, job_dir: str, events):
+    """Worker process entry point: simulate, post-process and report via a queue.
+    
+    Puts ('output', text), ('progress', message) and ('voxels', byte_count)
+    events while running and ends with ('finished', stl_path) or ('error', message).
+    """
+    def status(message):
+        events.put(('progress', message))
+    
+    def output(text):
+        events.put(('output', text))
+    
+    def voxels(count):
+        events.put(('voxels', count))
+    
+    try:
+        output_stl = Path(job_dir) / "volco_output.stl"
+        if not find_volco():
+            status("Volco not found - running in TEST MODE...")
+            create_test_stl(str(output_stl))
+        else:
+            actual_stl_path = run_volco_simulation(
+                gcode_path, params, str(Path(job_dir) / "results"), output, status, voxels,
+            )
+            # Both live under job_dir, so these are renames rather than copies
+            os.replace(actual_stl_path, output_stl)
+            move_voxel_grid(str(actual_stl_path), str(output_stl))
+            # Already in a worker process, so post-process in place
+            finalize_mesh(str(output_stl), params, status, in_process=True)
+        events.put(('finished', str(output_stl)))
+    except Exception as e:
+        events.put(('error', str(e) or type(e).__name__))
+
+
+def start_simulation_process(gcode_path: str, params: dict, job_dir: str):
+    """Start run_simulation_job in a spawned process. Returns (process, events)."""
+    # Spawn so the job starts from a clean interpreter with its own Volco import
+    context = multiprocessing.get_context('spawn')
+    events = context.Queue()
+    process = context.Process(
+        target=run_simulation_job,
+        args=(gcode_path, params, job_dir, events),
+        daemon=True,
+    )
+    process.start()
+    return process, events
+
+
+def iter_process_events(process, events, is_cancelled=lambda: False):
+    """Yield {'type', 'message'} events from a simulation process until it ends.
+    
+    Ends after a 'finished' or 'error' event, yields 'cancelled' once
+    is_cancelled() is true, and reports an error if the process dies silently.
+    """
+    while True:
+        try:
+            kind, message = events.get(timeout=0.5)
+        except queue.Empty:
+            if is_cancelled():
+                yield {'type': 'cancelled', 'message': ''}
+                return
+            if process.is_alive():
+                continue
+            try:
+                # The process may have exited right after its last event
+                kind, message = events.get(timeout=0.5)
+            except queue.Empty:
+                yield {'type': 'error', 'message': f"Simulation process exited with code {process.exitcode}"}
+                return
+        yield {'type': kind, 'message': message}
+        if kind in ('finished', 'error'):
+            return
+
+
 class SimulationWorker(QThread):
     """Worker thread for running Volco simulations."""
     
@@ -69,6 +397,13 @@ class SimulationWorker(QThread):
         self.last_progress_update = 0
         self.is_running = False
         self.simulation_start_time = 0
+        self.client = None
+        self.remote_job_id = None
+        self.process = None
+        self.cancelled = False
+        self.monitor = None
+        self.budget_exceeded = None
+        self.voxel_bytes = None
     
     def _handle_progress_output(self, text: str):
         """Handle progress updates from Volco stdout."""
@@ -98,164 +433,51 @@ class SimulationWorker(QThread):
         try:
             self.progress.emit("Initializing simulation...")
             
-            # Import Volco (add parent directory to path if needed)
-            try:
-                # Try to find Volco in multiple locations
-                volco_paths = [
-                    # For PyInstaller bundled version
-                    Path(sys._MEIPASS) / "volco" if hasattr(sys, '_MEIPASS') else None,
-                    # Development: sibling to volcogui
-                    Path(__file__).parent.parent.parent.parent / "volco",
-                    # Common development location
-                    Path.home() / "projects" / "gcode" / "volco",
-                ]
-                
-                # Filter out None paths
-                volco_paths = [p for p in volco_paths if p is not None]
-                
-                volco_found = False
-                for volco_path in volco_paths:
-                    if volco_path.exists() and (volco_path / "volco.py").exists():
-                        sys.path.insert(0, str(volco_path))
-                        volco_found = True
-                        break
-                
-                if not volco_found:
-                    # Fall back to test mode
-                    self.progress.emit("Volco not found - running in TEST MODE...")
-                    import time
-                    time.sleep(2)
-                    temp_dir = tempfile.gettempdir()
-                    self.output_stl = str(Path(temp_dir) / "volco_output.stl")
-                    self._create_test_stl(self.output_stl)
-                    self.progress.emit("Test simulation complete!")
-                    self.finished.emit(self.output_stl)
-                    return
-                
-                # Set up logging capture BEFORE importing volco
-                # This is critical because volco configures logging at module import time
-                import logging
-                
-                # Capture both stdout and stderr with progress tracking
-                old_stdout = sys.stdout
-                old_stderr = sys.stderr
-                captured_output = ProgressCapture(self._handle_progress_output, old_stderr)
-                sys.stdout = captured_output
-                sys.stderr = captured_output
-                
-                # Pre-configure logging BEFORE volco import
-                root_logger = logging.getLogger()
-                # Clear any existing handlers
-                root_logger.handlers.clear()
-                # Add our custom handler
-                new_handler = logging.StreamHandler(captured_output)
-                new_handler.setFormatter(logging.Formatter("%(levelname)s %(asctime)s %(message)s"))
-                root_logger.addHandler(new_handler)
-                root_logger.setLevel(logging.INFO)
-                
-                # Monkey-patch basicConfig to prevent volco from overriding our setup
-                original_basicConfig = logging.basicConfig
-                logging.basicConfig = lambda *args, **kwargs: None
-                
-                # NOW import volco - our logging will be used
-                from volco import run_simulation
-                
-                # Restore basicConfig (just in case)
-                logging.basicConfig = original_basicConfig
-                
-                self.progress.emit("Parsing G-code...")
-                
-                # Create a temporary output file
-                temp_dir = tempfile.gettempdir()
-                self.output_stl = str(Path(temp_dir) / "volco_output.stl")
-                
-                # Create temp directory for results
-                results_folder = str(Path(temp_dir) / "volcogui_results")
-                
+            # Create a temporary output file
+            temp_dir = tempfile.gettempdir()
+            output_name = self.params.get('output_name', "volco_output")
+            self.output_stl = str(Path(temp_dir) / f"{output_name}.stl")
+            
+            if self.params.get('remote_engine'):
+                self._run_remote(self.params['remote_engine'])
+                # Server already post-processed; only index locally
+                write_sidecar(self.output_stl)
+            elif self.params.get('isolated') or memory_budget(self.params) is not None:
+                if memory_budget(self.params) is not None:
+                    # Refuse before starting a process; the job reuses the estimate
+                    self.voxel_bytes = check_voxel_budget(self.gcode_path, self.params)
+                    self.params = dict(self.params, voxel_bytes=self.voxel_bytes)
+                # A separate process can be stopped at the memory budget without taking the GUI down
+                self._run_isolated(str(Path(temp_dir) / "volcogui_jobs" / output_name))
+            else:
+                # Import Volco (add parent directory to path if needed)
                 try:
-                    import time
-                    self.progress.emit("Running voxel simulation...")
-                    self.is_running = True
-                    self.simulation_start_time = time.time()
-                    
-                    # Start a thread to emit heartbeat updates every 2 seconds
-                    import threading
-                    def heartbeat():
-                        while self.is_running:
-                            time.sleep(2)
-                            if self.is_running:
-                                elapsed = int(time.time() - self.simulation_start_time)
-                                self.progress.emit(f"Voxelizing {self.total_filaments} filaments... {elapsed}s elapsed")
-                    
-                    heartbeat_thread = threading.Thread(target=heartbeat, daemon=True)
-                    heartbeat_thread.start()
-                    
-                    # Run Volco simulation
-                    output = run_simulation(
-                            gcode_path=self.gcode_path,
-                        printer_config={
-                            'nozzle_diameter': self.params['nozzle_diameter'],
-                            'feedstock_filament_diameter': 1.75,
-                            'nozzle_jerk_speed': 10.0,
-                            'extruder_jerk_speed': 5.0,
-                            'nozzle_acceleration': 1000.0,
-                            'extruder_acceleration': 5000.0,
-                        },
-                        sim_config={
-                            'simulation_name': 'volcogui_simulation',
-                            'results_folder': results_folder,
-                            'voxel_size': self.params['voxel_size'],
-                            'step_size': self.params['step_size'],
-                            'x_offset': 5 * self.params['nozzle_diameter'],
-                            'y_offset': 5 * self.params['nozzle_diameter'],
-                            'z_offset': 5 * self.params['nozzle_diameter'],
-                            'sphere_z_offset': 0.5 * self.params['nozzle_diameter'],
-                            'x_crop': ['all', 'all'],
-                            'y_crop': ['all', 'all'],
-                            'z_crop': ['all', 'all'],
-                            'radius_increment': 0.001,
-                            'solver_tolerance': 0.0001,
-                            'consider_acceleration': False,
-                            'stl_ascii': False,
-                        }
-                    )
-                
-                    self.is_running = False
-                    self.progress.emit("Generating mesh...")
-                    
-                    # Export STL (Volco creates the file in results_folder/simulation_name.stl)
-                    output.export_mesh_to_stl()
+                    if not find_volco():
+                        # Fall back to test mode
+                        self.progress.emit("Volco not found - running in TEST MODE...")
+                        import time
+                        time.sleep(2)
+                        create_test_stl(self.output_stl)
+                        self.progress.emit("Test simulation complete!")
+                        self.finished.emit(self.output_stl)
+                        return
                     
-                finally:
-                    self.is_running = False
-                    # Restore stdout and stderr
-                    sys.stdout = old_stdout
-                    sys.stderr = old_stderr
-                    output_text = captured_output.getvalue()
+                    results_name = "volcogui_results" if output_name == "volco_output" else f"volcogui_results_{output_name}"
+                    self._run_local(str(Path(temp_dir) / results_name))
                     
-                    # Extract progress info for debugging
-                    if "Number of printed filaments:" in output_text:
-                        match = re.search(r'Number of printed filaments: (\d+)', output_text)
-                        if match:
-                            total_filaments = match.group(1)
-                            self.progress.emit(f"Processed {total_filaments} filaments")
-                
-                # Get the actual STL path that Volco created
-                actual_stl_path = Path(results_folder) / "volcogui_simulation.stl"
-                
-                # Copy to our output location for consistency
-                if actual_stl_path.exists():
-                    shutil.copy(str(actual_stl_path), self.output_stl)
-                else:
-                    raise FileNotFoundError(f"STL file not found at {actual_stl_path}")
-                
-                self.progress.emit("Simulation complete!")
-                self.finished.emit(self.output_stl)
+                except ImportError as e:
+                    self.error.emit(f"Volco import failed: {str(e)}\n\nMake sure Volco is in the correct location.")
+                    return
                 
-            except ImportError as e:
-                self.error.emit(f"Volco import failed: {str(e)}\n\nMake sure Volco is in the correct location.")
-                return
+                finalize_mesh(self.output_stl, self.params, self.progress.emit)
+            
+            if self.monitor is not None and self.monitor.summary():
+                self.progress.emit(f"Resources: {self.monitor.summary()}")
+            self.progress.emit("Simulation complete!")
+            self.finished.emit(self.output_stl)
                 
+        except MemoryBudgetError as e:
+            self.error.emit(str(e))
         except ZeroDivisionError as e:
             self.error.emit(
                 f"Division by zero error in simulation.\n\n"
@@ -264,7 +486,8 @@ class SimulationWorker(QThread):
                 f"• G-code contains very short movements\n\n"
                 f"Try:\n"
                 f"• Reducing step_size (current: {self.params['step_size']}mm)\n"
-                f"• Increasing voxel_size\n\n"
+                f"• Increasing voxel_size\n"
+                f"• Enabling 'Merge Collinear Segments'\n\n"
                 f"Technical details: {str(e)}"
             )
         except Exception as e:
@@ -277,16 +500,154 @@ class SimulationWorker(QThread):
                     f"• Step size: {self.params['step_size']}mm\n"
                     f"• Voxel size: {self.params['voxel_size']}mm\n"
                     f"• Nozzle diameter: {self.params['nozzle_diameter']}mm\n\n"
-                    f"Try reducing the step_size or check your G-code for very short movements.\n\n"
+                    f"Try reducing the step_size, enabling 'Merge Collinear Segments'\n"
+                    f"or check your G-code for very short movements.\n\n"
                     f"Error: {error_msg}"
                 )
             else:
                 self.error.emit(f"Simulation failed: {error_msg}")
+    
+    def _start_heartbeat(self, pid: int = None):
+        """Start a thread that emits elapsed time and resource use every 2 seconds.
+        
+        pid is the process running the simulation (this one if None). Memory is
+        sampled more often, and an isolated simulation process that goes over
+        the budget is stopped. Remote jobs are not sampled.
+        """
+        import time
+        self.is_running = True
+        self.simulation_start_time = time.time()
+        if not self.params.get('remote_engine'):
+            # Estimated only when there is a budget to check; the job reports the real size
+            self.monitor = ResourceMonitor(pid, self.voxel_bytes, memory_budget(self.params))
+        monitor = self.monitor
+        
+        def heartbeat():
+            ticks = 0
+            while self.is_running:
+                time.sleep(0.5)
+                ticks += 1
+                if not self.is_running:
+                    break
+                if monitor is not None:
+                    monitor.sample()
+                    if monitor.over_budget and self.process is not None and self.process.is_alive():
+                        self.budget_exceeded = monitor.budget_message()
+                        self.process.terminate()
+                if ticks % 4 == 0:
+                    elapsed = int(time.time() - self.simulation_start_time)
+                    message = f"Voxelizing {self.total_filaments} filaments... {elapsed}s elapsed"
+                    if monitor is not None and monitor.status():
+                        message += f" | {monitor.status()}"
+                    self.progress.emit(message)
+        
+        heartbeat_thread = threading.Thread(target=heartbeat, daemon=True)
+        heartbeat_thread.start()
+    
+    def _on_voxel_space(self, voxel_bytes: int):
+        """Show the simulation's real voxel array size instead of the estimate."""
+        self.voxel_bytes = voxel_bytes
+        if self.monitor is not None:
+            self.monitor.set_voxel_bytes(voxel_bytes)
+    
+    def _run_local(self, results_folder: str):
+        """Run Volco in this process and copy its STL to self.output_stl."""
+        self._start_heartbeat()
+        try:
+            actual_stl_path = run_volco_simulation(
+                self.gcode_path, self.params, results_folder,
+                self._handle_progress_output, self.progress.emit, self._on_voxel_space,
+            )
+        finally:
+            self.is_running = False
+        
+        # Copy to our output location for consistency
+        shutil.copy(str(actual_stl_path), self.output_stl)
+        copy_voxel_grid(str(actual_stl_path), self.output_stl)
+    
+    def _follow_events(self, events, pid: int = None):
+        """Relay simulation events to our signals until the job finishes."""
+        self._start_heartbeat(pid)
+        try:
+            for event in events:
+                if event['type'] == 'output':
+                    self._handle_progress_output(event['message'])
+                elif event['type'] == 'progress':
+                    self.progress.emit(event['message'])
+                elif event['type'] == 'voxels':
+                    self._on_voxel_space(event['message'])
+                elif event['type'] == 'error':
+                    raise RemoteSimulationError(event['message'])
+                elif event['type'] == 'cancelled':
+                    raise RemoteSimulationError("Simulation was cancelled")
+                elif event['type'] == 'finished':
+                    return event['message']
+        finally:
+            self.is_running = False
+    
+    def _run_remote(self, address: str):
+        """Run the simulation on a simulation server and download its STL."""
+        self.progress.emit(f"Connecting to simulation server at {address}...")
+        self.client = SimulationClient(address)
+        # The memory budget is for this computer, not the server
+        remote_params = {k: v for k, v in self.params.items()
+                         if k not in ('remote_engine', 'memory_budget_gb')}
+        self.remote_job_id = self.client.submit(self.gcode_path, remote_params)
+        try:
+            self._follow_events(self.client.stream_events(self.remote_job_id))
             
-    def _create_test_stl(self, output_path: str):
-        """Create a simple test STL file for testing purposes."""
-        # Simple ASCII STL of a cube
-        stl_content = """solid cube
+            self.progress.emit("Downloading result mesh...")
+            self.client.fetch_result(self.remote_job_id, self.output_stl)
+            try:
+                grid_path = download_path(self.output_stl)
+                self.client.fetch_result(self.remote_job_id, str(grid_path), 'voxels')
+                install_download(self.output_stl, str(grid_path), self.params['voxel_size'])
+            except RemoteSimulationError:
+                # Older or test-mode jobs have no voxel grid
+                grid_path.unlink(missing_ok=True)
+        finally:
+            # Failed and cancelled jobs leave files on the server too
+            try:
+                self.client.delete(self.remote_job_id)
+            except (OSError, RemoteSimulationError):
+                pass
+    
+    def _run_isolated(self, job_dir: str):
+        """Run the simulation in a separate process, which cancel() can kill cleanly."""
+        Path(job_dir).mkdir(parents=True, exist_ok=True)
+        self.process, events = start_simulation_process(self.gcode_path, self.params, job_dir)
+        try:
+            job_stl = self._follow_events(
+                iter_process_events(self.process, events, lambda: self.cancelled), self.process.pid,
+            )
+        except RemoteSimulationError:
+            if self.budget_exceeded:
+                raise MemoryBudgetError(self.budget_exceeded) from None
+            raise
+        self.process.join(timeout=5)
+        
+        # Move the STL and its voxel grid to our output location, then drop the job's files
+        shutil.move(job_stl, self.output_stl)
+        move_voxel_grid(job_stl, self.output_stl)
+        shutil.rmtree(job_dir, ignore_errors=True)
+        write_sidecar(self.output_stl)
+    
+    def cancel(self):
+        """Cancel a remote or isolated simulation, if one is running."""
+        self.cancelled = True
+        if self.process is not None and self.process.is_alive():
+            self.process.terminate()
+        if self.client and self.remote_job_id:
+            try:
+                self.client.cancel(self.remote_job_id)
+            except (OSError, RemoteSimulationError):
+                pass
+            
+
+def create_test_stl(output_path: str):
+    """Create a simple test STL file for testing purposes."""
+    # Simple ASCII STL of a cube
+    stl_content = """solid cube
   facet normal 0 0 1
     outer loop
       vertex 0 0 10
@@ -373,5 +734,5 @@ class SimulationWorker(QThread):
   endfacet
 endsolid cube
 """
-        with open(output_path, 'w') as f:
-            f.write(stl_content)
+    with open(output_path, 'w') as f:
+        f.write(stl_content)
@@ -0,0 +1,340 @@
+"""Standalone simulation server for running Volco on another machine.
+
+Run with:
+    volcogui-server --host 0.0.0.0 --port 8765
+
+HTTP API (JSON unless noted):
+    POST   /jobs              gzip JSON {name, gcode_base64, params} -> {job_id}
+    GET    /jobs/<id>         job state
+    GET    /jobs/<id>/events  newline-delimited JSON progress stream
+    POST   /jobs/<id>/cancel  cancel a queued or running job
+    GET    /jobs/<id>/result  result STL as a chunked zlib stream
+    GET    /jobs/<id>/voxels  result voxel grid (.npy) as a chunked zlib stream
+    DELETE /jobs/<id>         cancel and remove the job's files
+
+There is no authentication, so only bind to trusted networks.
+"""
+
+import argparse
+import base64
+import gzip
+import json
+import multiprocessing
+import shutil
+import tempfile
+import threading
+import uuid
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from volcogui.backend.simulation_client import DEFAULT_PORT
+from volcogui.backend.simulation_runner import start_simulation_process, iter_process_events
+from volcogui.backend.voxel_io import voxel_path
+
+
+TERMINAL_STATES = ('finished', 'error', 'cancelled')
+HEARTBEAT_INTERVAL = 5.0
+RESULT_CHUNK_SIZE = 1 << 20
+
+
+class SimulationJob:
+    """A submitted simulation and the events it has produced so far."""
+
+    def __init__(self, job_id: str, job_dir: Path, gcode_path: Path, params: dict):
+        self.job_id = job_id
+        self.job_dir = job_dir
+        self.gcode_path = gcode_path
+        self.params = params
+        self.state = 'queued'
+        self.events = []
+        self.result_path = None
+        self.process = None
+        self.condition = threading.Condition()
+
+    def add_event(self, kind: str, message: str = ''):
+        with self.condition:
+            self.events.append({'type': kind, 'message': message})
+            self.condition.notify_all()
+
+    def finish(self, state: str, message: str = '') -> bool:
+        """Move to a terminal state. Returns False if the job already ended."""
+        with self.condition:
+            if self.state in TERMINAL_STATES:
+                return False
+            self.state = state
+            self.events.append({'type': state, 'message': message})
+            self.condition.notify_all()
+            return True
+
+    def iter_events(self):
+        """Yield events as they arrive, with heartbeats while idle, until the job ends."""
+        index = 0
+        while True:
+            with self.condition:
+                if index >= len(self.events):
+                    self.condition.wait(HEARTBEAT_INTERVAL)
+                new_events = self.events[index:]
+                index += len(new_events)
+            if not new_events:
+                yield {'type': 'heartbeat', 'message': ''}
+                continue
+            for event in new_events:
+                yield event
+                if event['type'] in TERMINAL_STATES:
+                    return
+
+    def to_dict(self) -> dict:
+        return {'job_id': self.job_id, 'state': self.state, 'name': self.gcode_path.name}
+
+
+class SimulationServer:
+    """Runs submitted jobs in separate processes, max_jobs at a time."""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = DEFAULT_PORT, max_jobs: int = 1,
+                 work_dir: str = None):
+        self.jobs = {}
+        self.lock = threading.Lock()
+        self.slots = threading.Semaphore(max_jobs)
+        self.work_dir = Path(work_dir or tempfile.mkdtemp(prefix="volcogui_server_"))
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def address(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"{host}:{port}"
+
+    def serve_forever(self):
+        self.httpd.serve_forever()
+
+    def start(self):
+        """Serve from a background thread (used when embedding the server)."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+
+    def shutdown(self):
+        """Stop serving and terminate any running jobs."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        with self.lock:
+            jobs = list(self.jobs.values())
+        for job in jobs:
+            self.cancel(job)
+
+    def submit(self, name: str, gcode: bytes, params: dict) -> SimulationJob:
+        """Start a job. Raises ValueError for a name that is not a plain file name."""
+        name = name or "input.gcode"
+        if name in ('.', '..') or '/' in name or '\\' in name or '\0' in name:
+            raise ValueError(f"Invalid G-code file name: {name!r}")
+        job_id = uuid.uuid4().hex
+        job_dir = self.work_dir / job_id
+        job_dir.mkdir()
+        # Written as received, so it is parsed exactly like the local file
+        gcode_path = job_dir / name
+        gcode_path.write_bytes(gcode)
+
+        # Identical jobs pick up where an interrupted one left off
+        params = dict(params, checkpoint_dir=str(self.work_dir / "checkpoints"), resume=True)
+        job = SimulationJob(job_id, job_dir, gcode_path, params)
+        with self.lock:
+            self.jobs[job_id] = job
+        threading.Thread(target=self._run, args=(job,), daemon=True).start()
+        return job
+
+    def get(self, job_id: str):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def cancel(self, job: SimulationJob):
+        if job.finish('cancelled', "Cancelled by client"):
+            if job.process is not None and job.process.is_alive():
+                job.process.terminate()
+
+    def delete(self, job: SimulationJob):
+        self.cancel(job)
+        with self.lock:
+            self.jobs.pop(job.job_id, None)
+        shutil.rmtree(job.job_dir, ignore_errors=True)
+
+    def _run(self, job: SimulationJob):
+        """Monitor thread: wait for a slot, run the job process and relay its events."""
+        with self.slots:
+            with job.condition:
+                if job.state in TERMINAL_STATES:
+                    return
+                job.state = 'running'
+            try:
+                job.process, events = start_simulation_process(
+                    str(job.gcode_path), job.params, str(job.job_dir),
+                )
+            except Exception as e:
+                # Otherwise the job would stay 'running' and its event stream never end
+                job.finish('error', f"Could not start the simulation process: {e}")
+                return
+            if job.state in TERMINAL_STATES:
+                # Cancelled while the process was starting
+                job.process.terminate()
+                return
+
+            for event in iter_process_events(job.process, events,
+                                             lambda: job.state in TERMINAL_STATES):
+                if event['type'] in ('output', 'progress'):
+                    job.add_event(event['type'], event['message'])
+                elif event['type'] == 'finished':
+                    job.result_path = Path(event['message'])
+                    job.finish('finished')
+                elif event['type'] == 'error':
+                    job.finish('error', event['message'])
+            job.process.join(timeout=5)
+            if job.process.is_alive():
+                job.process.terminate()
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status: int, data: dict):
+                body = json.dumps(data).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _start_chunked(self, content_type: str):
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Transfer-Encoding', 'chunked')
+                # Clients stop reading at the last event, so don't wait for another request
+                self.send_header('Connection', 'close')
+                self.end_headers()
+                self.close_connection = True
+
+            def _write_chunk(self, data: bytes):
+                if data:
+                    self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b"\r\n")
+                    self.wfile.flush()
+
+            def _end_chunked(self):
+                self.wfile.write(b"0\r\n\r\n")
+                self.wfile.flush()
+
+            def _route(self):
+                """Split /jobs/<id>/<action> into (job, action), replying 404 if unknown."""
+                parts = [p for p in self.path.split('/') if p]
+                if len(parts) < 2 or parts[0] != 'jobs':
+                    self._send_json(404, {'error': f"Unknown path: {self.path}"})
+                    return None, None
+                job = server.get(parts[1])
+                if job is None:
+                    self._send_json(404, {'error': f"Unknown job: {parts[1]}"})
+                    return None, None
+                return job, (parts[2] if len(parts) > 2 else '')
+
+            def do_POST(self):
+                if self.path.rstrip('/') == '/jobs':
+                    length = int(self.headers.get('Content-Length', 0))
+                    body = self.rfile.read(length)
+                    try:
+                        if self.headers.get('Content-Encoding') == 'gzip':
+                            body = gzip.decompress(body)
+                        payload = json.loads(body)
+                        if 'gcode_base64' in payload:
+                            gcode = base64.b64decode(payload['gcode_base64'], validate=True)
+                        else:
+                            # Clients from before raw uploads send text
+                            gcode = payload['gcode'].encode('utf-8')
+                        job = server.submit(payload['name'], gcode, payload['params'])
+                    except (ValueError, KeyError, TypeError, EOFError, OSError) as e:
+                        self._send_json(400, {'error': f"Invalid job request: {e}"})
+                        return
+                    self._send_json(201, job.to_dict())
+                    return
+
+                job, action = self._route()
+                if job is None:
+                    return
+                if action == 'cancel':
+                    server.cancel(job)
+                    self._send_json(200, job.to_dict())
+                else:
+                    self._send_json(404, {'error': f"Unknown action: {action}"})
+
+            def do_GET(self):
+                job, action = self._route()
+                if job is None:
+                    return
+                if action == '':
+                    self._send_json(200, job.to_dict())
+                elif action == 'events':
+                    self._start_chunked('application/x-ndjson')
+                    try:
+                        for event in job.iter_events():
+                            self._write_chunk(json.dumps(event).encode('utf-8') + b"\n")
+                        self._end_chunked()
+                    except (BrokenPipeError, ConnectionResetError):
+                        pass
+                elif action in ('result', 'voxels'):
+                    if job.state != 'finished':
+                        self._send_json(409, {'error': f"Job is {job.state}, no result available"})
+                        return
+                    path = job.result_path if action == 'result' else voxel_path(job.result_path)
+                    if not path.exists():
+                        self._send_json(404, {'error': f"Job has no {action}"})
+                        return
+                    self._start_chunked('application/octet-stream')
+                    compressor = zlib.compressobj(6)
+                    try:
+                        with open(path, 'rb') as f:
+                            while True:
+                                data = f.read(RESULT_CHUNK_SIZE)
+                                if not data:
+                                    break
+                                self._write_chunk(compressor.compress(data))
+                        self._write_chunk(compressor.flush())
+                        self._end_chunked()
+                    except (BrokenPipeError, ConnectionResetError):
+                        pass
+                else:
+                    self._send_json(404, {'error': f"Unknown action: {action}"})
+
+            def do_DELETE(self):
+                job, action = self._route()
+                if job is None:
+                    return
+                server.delete(job)
+                self._send_json(200, job.to_dict())
+
+        return Handler
+
+
+def main():
+    """Run the simulation server from the command line."""
+    parser = argparse.ArgumentParser(description="VolcoGUI simulation server")
+    parser.add_argument('--host', default='127.0.0.1', help="Address to bind (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+    parser.add_argument('--max-jobs', type=int, default=1, help="Simulations to run at once")
+    parser.add_argument('--work-dir', default=None, help="Directory for job files")
+    args = parser.parse_args()
+
+    server = SimulationServer(args.host, args.port, args.max_jobs, args.work_dir)
+    print(f"VolcoGUI simulation server listening on {server.address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    main()
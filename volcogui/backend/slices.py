@@ -0,0 +1,79 @@
+"""2D cross-sections of retained voxel grids.
+
+A slice is plain array indexing on the memory-mapped grid, so only the
+pages holding that plane are read from disk. Grids are saved in Fortran
+order (see voxel_io): a Z slice is one contiguous block, a Y slice one
+row of nx voxels per layer, and an X slice one voxel from every row,
+which reads pages from across the whole file. The plane is coloured through a cached
+lookup table.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from volcogui.backend.voxel_io import OCCUPANCY_THRESHOLD
+
+
+AXES = ('z', 'y', 'x')
+
+# Lookup table entries: 0..FILL_LEVELS-1 span empty to full, the last one marks overfill
+FILL_LEVELS = 255
+OVERFILL = 255
+
+EMPTY_COLOR = (32, 32, 40)
+PARTIAL_COLOR = (70, 130, 180)
+FULL_COLOR = (235, 235, 225)
+OVERFILL_COLOR = (220, 60, 50)
+
+
+@lru_cache(maxsize=None)
+def colormap() -> np.ndarray:
+    """(256, 4) uint8 RGBA table: empty → partially filled → full, plus overfill.
+
+    The colour changes quickly around the occupancy threshold so the
+    part's boundary and voids between beads stand out.
+    """
+    fill = np.linspace(0.0, 1.0, FILL_LEVELS)[:, None]
+    empty, partial, full = (np.array(c, dtype=np.float64) for c in (EMPTY_COLOR, PARTIAL_COLOR, FULL_COLOR))
+    low = empty + (partial - empty) * np.clip(fill / OCCUPANCY_THRESHOLD, 0, 1)
+    high = partial + (full - partial) * np.clip((fill - OCCUPANCY_THRESHOLD) / (1 - OCCUPANCY_THRESHOLD), 0, 1)
+    rgb = np.where(fill < OCCUPANCY_THRESHOLD, low, high)
+    table = np.empty((256, 4), dtype=np.uint8)
+    table[:FILL_LEVELS, :3] = np.round(rgb)
+    table[OVERFILL, :3] = OVERFILL_COLOR
+    table[:, 3] = 255
+    table.setflags(write=False)
+    return table
+
+
+def slice_count(shape: tuple, axis: str) -> int:
+    return shape[2 - AXES.index(axis)]
+
+
+def slice_plane(grid: np.ndarray, axis: str, index: int) -> np.ndarray:
+    """One plane of an (x, y, z) grid as an image array, rows top to bottom.
+
+    Z slices are seen from above (x right, y up); X and Y slices from the
+    side with z up.
+    """
+    if axis == 'z':
+        plane = grid[:, :, index].T      # (y, x)
+    elif axis == 'y':
+        plane = grid[:, index, :].T      # (z, x)
+    else:
+        plane = grid[index, :, :].T      # (z, y)
+    return plane[::-1]
+
+
+def plane_rgba(plane: np.ndarray) -> np.ndarray:
+    """Colour a plane of fill fractions through the cached colormap."""
+    plane = np.asarray(plane, dtype=np.float32)
+    indices = np.clip(plane * (FILL_LEVELS - 1), 0, FILL_LEVELS - 1).astype(np.uint8)
+    indices[plane > 1.0 + 1e-6] = OVERFILL
+    return np.ascontiguousarray(colormap()[indices])
+
+
+def fill_fraction(plane: np.ndarray) -> float:
+    """Share of the plane's voxels that count as material."""
+    return float(np.count_nonzero(np.asarray(plane) >= OCCUPANCY_THRESHOLD)) / max(plane.size, 1)
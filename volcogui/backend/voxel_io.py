@@ -0,0 +1,135 @@
+"""Retained voxel grids stored next to result STLs.
+
+The grid is a plain .npy so it can be memory-mapped, with its voxel size
+and file name in a small JSON file alongside. Every save writes a new
+file (<name>.voxels-<id>.npy) and then points the JSON at it, so a viewer
+memory-mapping the previous grid never has its file replaced underneath
+it (Windows refuses to replace a mapped file). Superseded grids are
+deleted once nothing maps them.
+
+Grids are written in Fortran order: each Z layer is one contiguous block,
+so a layer slice reads only that block. A Y slice reads one row per layer;
+an X slice takes one voxel from every row, so it reads pages from across
+the whole file.
+"""
+
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+VOXELS_SUFFIX = '.voxels.npy'
+VOXELS_META_SUFFIX = '.voxels.json'
+
+# Voxel values at or above this count as material (matches the marching-cubes level)
+OCCUPANCY_THRESHOLD = 0.5
+
+# Z layers copied at a time when saving, to avoid a full copy of the grid
+_SAVE_LAYERS = 16
+
+
+def voxel_path(stl_path: str) -> Path:
+    """Path of the voxel grid that currently belongs to an STL file."""
+    path = Path(stl_path)
+    try:
+        name = json.loads(_meta_path(stl_path).read_text()).get('file')
+    except (OSError, ValueError):
+        name = None
+    # Grids saved before per-save file names use the plain name
+    return path.with_name(name or path.stem + VOXELS_SUFFIX)
+
+
+def _new_grid_path(stl_path: str) -> Path:
+    path = Path(stl_path)
+    return path.with_name(f"{path.stem}.voxels-{uuid.uuid4().hex[:12]}.npy")
+
+
+def _meta_path(stl_path: str) -> Path:
+    path = Path(stl_path)
+    return path.with_name(path.stem + VOXELS_META_SUFFIX)
+
+
+def _install(stl_path: str, grid_path: Path, voxel_size: float):
+    """Point the STL's metadata at a newly written grid and drop older grids."""
+    grid = np.load(grid_path, mmap_mode='r')
+    meta = {
+        'voxel_size': voxel_size,
+        'shape': list(grid.shape),
+        'dtype': str(grid.dtype),
+        'file': grid_path.name,
+    }
+    del grid
+    meta_path = _meta_path(stl_path)
+    tmp = meta_path.with_name(meta_path.name + '.tmp')
+    tmp.write_text(json.dumps(meta))
+    os.replace(tmp, meta_path)
+    stem = Path(stl_path).stem
+    for old in list(grid_path.parent.glob(f"{stem}.voxels-*.npy")) + [grid_path.with_name(stem + VOXELS_SUFFIX)]:
+        if old != grid_path and old.exists():
+            try:
+                old.unlink()
+            except OSError:
+                # Still mapped by a viewer (Windows); removed by a later save
+                pass
+
+
+def save_voxel_grid(stl_path: str, grid: np.ndarray, voxel_size: float):
+    """Save a result's voxel grid next to its STL (Fortran order, layer by layer)."""
+    target = _new_grid_path(stl_path)
+    out = np.lib.format.open_memmap(target, mode='w+', dtype=grid.dtype,
+                                    shape=grid.shape, fortran_order=True)
+    for start in range(0, grid.shape[2], _SAVE_LAYERS):
+        out[:, :, start:start + _SAVE_LAYERS] = grid[:, :, start:start + _SAVE_LAYERS]
+    out.flush()
+    del out
+    _install(stl_path, target, voxel_size)
+
+
+def download_path(stl_path: str) -> Path:
+    """A fresh path to download a grid to before install_download() adopts it."""
+    return _new_grid_path(stl_path)
+
+
+def install_download(stl_path: str, grid_path: str, voxel_size: float):
+    """Adopt a downloaded grid as the STL's voxel grid."""
+    _install(stl_path, Path(grid_path), voxel_size)
+
+
+def has_voxel_grid(stl_path: str) -> bool:
+    return _meta_path(stl_path).exists() and voxel_path(stl_path).exists()
+
+
+def load_voxel_grid(stl_path: str, mmap: bool = True) -> Optional[Tuple[np.ndarray, float]]:
+    """Load (grid, voxel_size) for an STL, memory-mapped by default. None if absent."""
+    if not has_voxel_grid(stl_path):
+        return None
+    meta = json.loads(_meta_path(stl_path).read_text())
+    grid = np.load(voxel_path(stl_path), mmap_mode='r' if mmap else None)
+    return grid, meta['voxel_size']
+
+
+def copy_voxel_grid(source_stl: str, target_stl: str):
+    """Copy a result's voxel grid along with its STL, if it has one."""
+    if has_voxel_grid(source_stl):
+        meta = json.loads(_meta_path(source_stl).read_text())
+        target = _new_grid_path(target_stl)
+        shutil.copy(str(voxel_path(source_stl)), str(target))
+        _install(target_stl, target, meta['voxel_size'])
+
+
+def move_voxel_grid(source_stl: str, target_stl: str):
+    """Move a result's voxel grid along with its STL, if it has one.
+
+    A rename on the same file system, so large grids are not copied.
+    """
+    if has_voxel_grid(source_stl):
+        meta = json.loads(_meta_path(source_stl).read_text())
+        target = _new_grid_path(target_stl)
+        shutil.move(str(voxel_path(source_stl)), str(target))
+        _install(target_stl, target, meta['voxel_size'])
+        _meta_path(source_stl).unlink()
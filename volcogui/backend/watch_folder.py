@@ -0,0 +1,443 @@
+"""Watch folders for G-code and simulate new or changed files automatically.
+
+Run headless with:
+    volcogui-watch /shared/gcode --workers 4
+
+Folders are polled rather than watched through OS notifications, which
+are unreliable on network shares. A file is only picked up once its size
+and modification time have stayed the same for a settle time, so files
+that are still being copied in are left alone. Each result is written
+next to its G-code as <name>.volco.stl with its voxel grid.
+
+A folder can override the default parameters with a volcogui.json file.
+The content hash of every handled file (G-code plus the parameters that
+affect deposition) is recorded in .volcogui_watch.json, so unchanged
+files are not simulated again, also after a restart.
+
+Finished results also get an offscreen thumbnail and HTML report, and the
+folder's contact sheet is updated (see report.py).
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from volcogui.backend.checkpoint import checkpoint_key, default_checkpoint_root
+from volcogui.backend.report import ReportPool
+from volcogui.backend.simulation_runner import start_simulation_process, iter_process_events
+from volcogui.backend.voxel_io import copy_voxel_grid
+
+
+PARAMS_FILE = 'volcogui.json'
+LEDGER_FILE = '.volcogui_watch.json'
+RESULT_SUFFIX = '.volco.stl'
+
+DEFAULT_PARAMS = {
+    'voxel_size': 0.1,
+    'step_size': 0.1,
+    'nozzle_diameter': 0.4,
+}
+
+
+def result_path(gcode_path: Path) -> Path:
+    return gcode_path.with_name(gcode_path.stem + RESULT_SUFFIX)
+
+
+def _write_json(path: Path, data: dict):
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_text(json.dumps(data, indent=2))
+    os.replace(tmp, path)
+
+
+class FolderWatcher:
+    """Polls folders for G-code and simulates it in up to `workers` processes.
+
+    callback(kind, gcode_path, message) is called from background threads
+    with kind one of 'queued', 'started', 'progress', 'skipped', 'finished'
+    (message is the result STL), 'error', and 'report' (message is the HTML
+    report) or 'report_failed'. Reports are rendered in up to `report_workers`
+    processes; 0 turns them off.
+    """
+
+    def __init__(self, folders, params: dict = None, workers: int = 1, settle: float = 2.0,
+                 interval: float = 1.0, callback=None, report_workers: int = 1):
+        self.folders = [Path(folder) for folder in folders]
+        self.params = dict(DEFAULT_PARAMS, **(params or {}))
+        self.workers = max(1, workers)
+        self.settle = settle
+        self.interval = interval
+        self.callback = callback or (lambda kind, path, message: None)
+        self.lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+        self._threads = []
+        self._processes = set()
+        self.report_workers = report_workers
+        self._reports = None
+        self._pending_reports = set()
+        # path -> (size, mtime) and when it was first seen like that
+        self._signatures = {}
+        # path -> signature that was already queued or skipped
+        self._handled = {}
+        # key -> G-code files with that content waiting for the queued or running job
+        self._in_flight = {}
+        # Set after a scan that found no file still settling
+        self._settled = threading.Event()
+        self._work_dir = Path(tempfile.mkdtemp(prefix="volcogui_watch_"))
+
+    # Parameters and ledger
+
+    def folder_params(self, folder: Path) -> dict:
+        """Default parameters with the folder's volcogui.json applied."""
+        params = dict(self.params)
+        params_file = folder / PARAMS_FILE
+        if params_file.exists():
+            try:
+                params.update(json.loads(params_file.read_text()))
+            except (OSError, ValueError) as e:
+                self.callback('error', str(params_file), f"Ignoring invalid {PARAMS_FILE}: {e}")
+        # Interrupted jobs resume, as on the simulation server
+        params.setdefault('checkpoint_dir', str(default_checkpoint_root()))
+        params.setdefault('resume', True)
+        return params
+
+    def _ledger(self, folder: Path) -> dict:
+        try:
+            return json.loads((folder / LEDGER_FILE).read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _record(self, gcode_path: Path, key: str, entry: dict):
+        with self.lock:
+            ledger = self._ledger(gcode_path.parent)
+            ledger[key] = dict(entry, gcode=gcode_path.name, time=time.time())
+            _write_json(gcode_path.parent / LEDGER_FILE, ledger)
+
+    def _reuse_result(self, gcode_path: Path, key: str):
+        """Message if this content and parameters were handled before, else None.
+
+        A finished result is copied for a file with the same content under
+        another name. Failed jobs are not retried until the file or the
+        parameters change.
+        """
+        with self.lock:
+            entry = self._ledger(gcode_path.parent).get(key)
+        if entry is None:
+            return None
+        if entry['state'] != 'finished':
+            return f"Failed before: {entry.get('message', '')}"
+        previous = gcode_path.parent / entry['result']
+        if not previous.exists():
+            return None
+        if previous != result_path(gcode_path) and not result_path(gcode_path).exists():
+            self._copy_result(previous, gcode_path)
+            return f"Same content as {entry['gcode']}, result copied"
+        return "Already simulated"
+
+    def _copy_result(self, source: Path, gcode_path: Path) -> Path:
+        """Copy a result STL and its voxel grid to be gcode_path's result."""
+        target = result_path(gcode_path)
+        tmp = target.with_name(target.name + '.tmp')
+        shutil.copy(source, tmp)
+        os.replace(tmp, target)
+        copy_voxel_grid(str(source), str(target))
+        return target
+
+    # Polling
+
+    def scan(self):
+        """Queue every G-code file that has settled and has not been handled."""
+        now = time.monotonic()
+        settling = 0
+        for folder in self.folders:
+            if not folder.is_dir():
+                continue
+            for path in sorted(folder.glob('*.gcode')):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                signature = (stat.st_size, stat.st_mtime_ns)
+                seen = self._signatures.get(path)
+                if seen is None or seen[0] != signature:
+                    # New or still being written: wait for it to settle
+                    self._signatures[path] = (signature, now)
+                    settling += 1
+                    continue
+                if self._handled.get(path) == signature:
+                    continue
+                if now - seen[1] < self.settle:
+                    settling += 1
+                    continue
+                self._handled[path] = signature
+                params = self.folder_params(folder)
+                key = checkpoint_key(str(path), params)
+                reason = self._reuse_result(path, key)
+                if reason is not None:
+                    self.callback('skipped', str(path), reason)
+                    continue
+                with self.lock:
+                    waiting = self._in_flight.get(key)
+                    if waiting is not None:
+                        # Same content is already queued or running; share its result
+                        waiting.append((path, params))
+                        continue
+                    self._in_flight[key] = []
+                self.callback('queued', str(path), "")
+                self._queue.put((path, params, key))
+        if settling:
+            self._settled.clear()
+        else:
+            self._settled.set()
+
+    def _poll(self):
+        while not self._stop.is_set():
+            self.scan()
+            self._stop.wait(self.interval)
+
+    # Simulation
+
+    def _work(self):
+        while not self._stop.is_set():
+            try:
+                path, params, key = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            outcome = None
+            try:
+                outcome = self._simulate(path, params, key)
+            finally:
+                self._resolve_duplicates(path, key, outcome)
+                self._queue.task_done()
+
+    def _resolve_duplicates(self, path: Path, key: str, outcome):
+        """Settle files that waited for the job with the same content.
+
+        outcome is ('finished', result STL), ('error', message) or None if
+        the job did not complete; then the first waiting file is queued.
+        """
+        with self.lock:
+            waiting = self._in_flight.pop(key, [])
+        if outcome is None:
+            if waiting and not self._stop.is_set():
+                (first, params), rest = waiting[0], waiting[1:]
+                with self.lock:
+                    self._in_flight[key] = rest
+                self.callback('queued', str(first), "")
+                self._queue.put((first, params, key))
+            return
+        state, message = outcome
+        for duplicate, params in waiting:
+            try:
+                if state == 'finished':
+                    target = self._copy_result(Path(message), duplicate)
+                    self._record(duplicate, key, {'state': 'finished', 'result': target.name})
+                    self.callback('skipped', str(duplicate), f"Same content as {path.name}, result copied")
+                    self._submit_report(duplicate, target, params)
+                else:
+                    self._record(duplicate, key, {'state': 'error', 'message': message})
+                    self.callback('skipped', str(duplicate), f"Failed before: {message}")
+            except OSError as e:
+                self.callback('skipped', str(duplicate), f"Could not copy the result: {e}")
+
+    def _simulate(self, path: Path, params: dict, key: str):
+        """Run one job process and copy its result next to the G-code.
+
+        Returns ('finished', result STL), ('error', message) or None if stopped.
+        """
+        self.callback('started', str(path), "")
+        outcome = None
+        job_dir = None
+        process = None
+        try:
+            # Unique per job: same-named files in different folders may run at once
+            self._work_dir.mkdir(parents=True, exist_ok=True)
+            job_dir = Path(tempfile.mkdtemp(prefix=f"{path.stem}_", dir=self._work_dir))
+            process, events = start_simulation_process(str(path), params, str(job_dir))
+            with self.lock:
+                self._processes.add(process)
+            for event in iter_process_events(process, events, self._stop.is_set):
+                if event['type'] == 'progress':
+                    self.callback('progress', str(path), event['message'])
+                elif event['type'] == 'finished':
+                    target = self._copy_result(Path(event['message']), path)
+                    self._record(path, key, {'state': 'finished', 'result': target.name})
+                    outcome = ('finished', str(target))
+                    self.callback('finished', str(path), str(target))
+                    self._submit_report(path, target, params)
+                elif event['type'] == 'error':
+                    self._record(path, key, {'state': 'error', 'message': event['message']})
+                    outcome = ('error', event['message'])
+                    self.callback('error', str(path), event['message'])
+        except Exception as e:
+            message = str(e) or type(e).__name__
+            if outcome is None:
+                outcome = ('error', message)
+                self.callback('error', str(path), message)
+            else:
+                # Already reported as finished; only submitting its report can fail
+                # after that, and another 'error' would count the job twice
+                self.callback('report_failed', str(path), message)
+        finally:
+            if process is not None:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+                with self.lock:
+                    self._processes.discard(process)
+            if job_dir is not None:
+                shutil.rmtree(job_dir, ignore_errors=True)
+        return outcome
+
+    def _submit_report(self, path: Path, target: Path, params: dict):
+        if self._reports is None:
+            return
+        future = self._reports.submit(str(target), str(path), params)
+        with self.lock:
+            self._pending_reports.add(future)
+        future.add_done_callback(lambda f: self._report_done(path, f))
+
+    def _report_done(self, path: Path, future):
+        with self.lock:
+            self._pending_reports.discard(future)
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            # The result itself is fine; only its report is missing
+            self.callback('report_failed', str(path), str(future.exception()))
+        else:
+            self.callback('report', str(path), str(future.result()))
+
+    # Lifecycle
+
+    def start(self):
+        """Start polling and the worker threads."""
+        self._stop.clear()
+        if self.report_workers > 0 and self._reports is None:
+            self._reports = ReportPool(self.report_workers)
+        self._threads = [threading.Thread(target=self._poll, daemon=True)]
+        self._threads += [threading.Thread(target=self._work, daemon=True) for _ in range(self.workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        """Stop polling and terminate running simulations (they resume from checkpoints)."""
+        self._stop.set()
+        with self.lock:
+            processes = list(self._processes)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for thread in self._threads:
+            thread.join(timeout=10)
+        self._threads = []
+        if self._reports is not None:
+            self._reports.shutdown()
+            self._reports = None
+        shutil.rmtree(self._work_dir, ignore_errors=True)
+
+    def wait_settled(self):
+        """Block until a scan finds no file still settling (used by --once).
+
+        Every file present by then has been queued, skipped or shared with
+        an identical one, so wait_idle() afterwards covers all of them.
+        """
+        while not self._stop.is_set():
+            if self._settled.wait(0.2):
+                return
+
+    def wait_idle(self):
+        """Block until nothing is queued or running (used by --once)."""
+        while True:
+            with self.lock:
+                busy = bool(self._processes or self._pending_reports)
+            if not busy and self._queue.unfinished_tasks == 0:
+                return
+            time.sleep(0.2)
+
+
+class WatchFolderController(QObject):
+    """Qt wrapper that relays FolderWatcher callbacks as signals."""
+
+    event = pyqtSignal(str, str, str)  # kind, G-code path, message
+
+    def __init__(self):
+        super().__init__()
+        self.watcher = None
+
+    def is_active(self) -> bool:
+        return self.watcher is not None
+
+    def start(self, folder: str, params: dict, workers: int, report_workers: int = 1):
+        self.stop()
+        self.watcher = FolderWatcher([folder], params, workers, callback=self.event.emit,
+                                     report_workers=report_workers)
+        self.watcher.start()
+
+    def stop(self):
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+
+
+_print_lock = threading.Lock()
+
+
+def _print_event(kind: str, path: str, message: str):
+    if kind == 'progress':
+        return
+    text = f"[{kind}] {path}"
+    if message:
+        text += f": {message}"
+    # Called from several threads; keep lines whole
+    with _print_lock:
+        print(text, flush=True)
+
+
+def main():
+    """Watch folders from the command line."""
+    parser = argparse.ArgumentParser(description="Simulate G-code dropped into folders")
+    parser.add_argument('folders', nargs='+', help="Folders to watch")
+    parser.add_argument('--workers', type=int, default=1, help="Simulations to run at once")
+    parser.add_argument('--params', default=None,
+                        help=f"JSON file with default parameters (a folder's {PARAMS_FILE} overrides it)")
+    parser.add_argument('--settle', type=float, default=2.0,
+                        help="Seconds a file must stay unchanged before it is simulated")
+    parser.add_argument('--interval', type=float, default=1.0, help="Seconds between folder scans")
+    parser.add_argument('--report-workers', type=int, default=1,
+                        help="Processes rendering thumbnails and HTML reports (0 for none)")
+    parser.add_argument('--once', action='store_true',
+                        help="Simulate what is in the folders now, then exit")
+    args = parser.parse_args()
+
+    params = json.loads(Path(args.params).read_text()) if args.params else {}
+    watcher = FolderWatcher(args.folders, params, args.workers, args.settle, args.interval,
+                            callback=_print_event, report_workers=args.report_workers)
+    print(f"Watching {', '.join(args.folders)} with {watcher.workers} worker(s)")
+    watcher.start()
+    try:
+        if args.once:
+            # Let existing files settle and get queued, then drain the queue
+            watcher.wait_settled()
+            watcher.wait_idle()
+        else:
+            while True:
+                time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.stop()
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    main()
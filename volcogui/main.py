@@ -1,12 +1,16 @@
 """Main application entry point for VolcoGUI."""
 
 import sys
+import multiprocessing
 from PyQt6.QtWidgets import QApplication
 from volcogui.ui.main_window import MainWindow
 
 
 def main():
     """Launch the VolcoGUI application."""
+    # Required for worker processes in PyInstaller builds
+    multiprocessing.freeze_support()
+    
     app = QApplication(sys.argv)
     app.setApplicationName("VolcoGUI")
     app.setOrganizationName("Volco")
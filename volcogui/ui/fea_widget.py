@@ -0,0 +1,151 @@
+"""FEA load case widget."""
+
+from PyQt6.QtWidgets import (
+    QDoubleSpinBox, QSpinBox, QComboBox, QGroupBox, QFormLayout, QPushButton, QLabel
+)
+
+from volcogui.backend.fea import DEFAULT_LOAD_CASE, FACES
+
+
+FACE_LABELS = {
+    'x-': "X min", 'x+': "X max",
+    'y-': "Y min", 'y+': "Y max",
+    'z-': "Z min (bed)", 'z+': "Z max (top)",
+}
+
+# Result fields that can be shown in the viewer
+FIELDS = ['von Mises Stress', 'Displacement Magnitude']
+
+
+class FEAWidget(QGroupBox):
+    """Widget for running a linear-elastic FEA load case on the simulated part."""
+
+    def __init__(self):
+        super().__init__("Structural Analysis (FEA)")
+        self._setup_ui()
+
+    def _setup_ui(self):
+        """Set up the user interface."""
+        layout = QFormLayout()
+        layout.setSpacing(10)
+
+        # Material
+        self.youngs_modulus = QDoubleSpinBox()
+        self.youngs_modulus.setDecimals(0)
+        self.youngs_modulus.setRange(1.0, 500000.0)
+        self.youngs_modulus.setSingleStep(100.0)
+        self.youngs_modulus.setValue(DEFAULT_LOAD_CASE['youngs_modulus'])
+        self.youngs_modulus.setSuffix(" MPa")
+        self.youngs_modulus.setToolTip("Young's modulus of the printed material")
+        layout.addRow("Young's Modulus:", self.youngs_modulus)
+
+        self.poisson_ratio = QDoubleSpinBox()
+        self.poisson_ratio.setDecimals(2)
+        self.poisson_ratio.setRange(0.0, 0.49)
+        self.poisson_ratio.setSingleStep(0.01)
+        self.poisson_ratio.setValue(DEFAULT_LOAD_CASE['poisson_ratio'])
+        self.poisson_ratio.setToolTip("Poisson's ratio (changing it re-assembles the stiffness matrix)")
+        layout.addRow("Poisson's Ratio:", self.poisson_ratio)
+
+        # Boundary conditions
+        self.fixed_face = self._face_input(DEFAULT_LOAD_CASE['fixed_face'])
+        self.fixed_face.setToolTip("Face of the part's bounding box clamped in all directions")
+        layout.addRow("Fixed Face:", self.fixed_face)
+
+        self.loaded_face = self._face_input(DEFAULT_LOAD_CASE['loaded_face'])
+        self.loaded_face.setToolTip("Face displaced along its normal by the applied strain")
+        layout.addRow("Loaded Face:", self.loaded_face)
+
+        self.strain = QDoubleSpinBox()
+        self.strain.setDecimals(2)
+        self.strain.setRange(-10.0, 10.0)
+        self.strain.setSingleStep(0.1)
+        self.strain.setValue(DEFAULT_LOAD_CASE['strain'] * 100)
+        self.strain.setSuffix(" %")
+        self.strain.setToolTip(
+            "Applied displacement as a percentage of the part's length along\n"
+            "the loaded face's normal (negative = compression)"
+        )
+        layout.addRow("Applied Strain:", self.strain)
+
+        # Mesh
+        self.coarsening_levels = QSpinBox()
+        self.coarsening_levels.setRange(0, 4)
+        self.coarsening_levels.setValue(DEFAULT_LOAD_CASE['coarsening_levels'])
+        self.coarsening_levels.setSpecialValueText("Off")
+        self.coarsening_levels.setToolTip(
+            "Merge solid interior voxels into elements up to 2^N voxels wide\n"
+            "(surfaces and filament boundaries keep full resolution)"
+        )
+        layout.addRow("Interior Coarsening:", self.coarsening_levels)
+
+        # Displayed field
+        self.field = QComboBox()
+        self.field.addItems(FIELDS)
+        self.field.setToolTip("Result field shown on the part")
+        layout.addRow("Show:", self.field)
+
+        self.run_button = QPushButton("Run FEA")
+        self.run_button.setEnabled(False)
+        self.run_button.setToolTip("Needs a simulation result with a saved voxel grid")
+        layout.addRow(self.run_button)
+
+        self.summary = QLabel("")
+        self.summary.setWordWrap(True)
+        self.summary.setStyleSheet("color: #666; font-size: 11px;")
+        layout.addRow(self.summary)
+
+        self.setLayout(layout)
+
+    def _face_input(self, default: str) -> QComboBox:
+        """Create a combo box listing the bounding box faces."""
+        combo = QComboBox()
+        for face in FACES:
+            combo.addItem(FACE_LABELS[face], face)
+        combo.setCurrentIndex(FACES.index(default))
+        return combo
+
+    def get_parameters(self) -> dict:
+        """Get the current load case as a dictionary."""
+        return {
+            'youngs_modulus': self.youngs_modulus.value(),
+            'poisson_ratio': self.poisson_ratio.value(),
+            'fixed_face': self.fixed_face.currentData(),
+            'loaded_face': self.loaded_face.currentData(),
+            'strain': self.strain.value() / 100,
+            'coarsening_levels': self.coarsening_levels.value(),
+        }
+
+    def set_parameters(self, params: dict):
+        """Set the load case from a dictionary."""
+        if 'youngs_modulus' in params:
+            self.youngs_modulus.setValue(params['youngs_modulus'])
+        if 'poisson_ratio' in params:
+            self.poisson_ratio.setValue(params['poisson_ratio'])
+        if 'fixed_face' in params:
+            self.fixed_face.setCurrentIndex(FACES.index(params['fixed_face']))
+        if 'loaded_face' in params:
+            self.loaded_face.setCurrentIndex(FACES.index(params['loaded_face']))
+        if 'strain' in params:
+            self.strain.setValue(params['strain'] * 100)
+        if 'coarsening_levels' in params:
+            self.coarsening_levels.setValue(params['coarsening_levels'])
+
+    def show_summary(self, stats: dict):
+        """Show the key numbers of a finished run."""
+        reuse = "reused" if stats['geometry_reused'] else f"assembled in {stats['assembly_time']:.1f} s"
+        text = (
+            f"{stats['elements']:,} elements, {stats['dofs']:,} DOFs (stiffness {reuse})\n"
+            f"{stats['full_resolution_dofs'] / stats['dofs']:.1f}x fewer DOFs than one "
+            f"element per voxel ({stats['voxels']:,} voxels)\n"
+            f"{stats['preconditioner'].upper()}-PCG: {stats['iterations']} iterations "
+            f"in {stats['solve_time']:.1f} s\n"
+            f"Max displacement {stats['max_displacement']:.4f} mm, "
+            f"max von Mises {stats['max_von_mises']:.1f} MPa\n"
+            f"Reaction force {stats['reaction_force']:.1f} N"
+        )
+        if not stats['converged']:
+            text += f"\nWarning: not converged (residual {stats['residual']:.1e})"
+        if stats['dropped_voxels']:
+            text += f"\n{stats['dropped_voxels']:,} voxels not connected to the part were ignored"
+        self.summary.setText(text)
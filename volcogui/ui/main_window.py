@@ -1,17 +1,30 @@
 """Main window for VolcoGUI application."""
 
+from pathlib import Path
+
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
     QLabel, QPushButton, QGroupBox, QMessageBox,
-    QSplitter, QStatusBar, QProgressDialog
+    QSplitter, QStatusBar, QProgressDialog, QScrollArea, QTabWidget
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer
 from PyQt6.QtGui import QDragEnterEvent, QDropEvent
 
 from volcogui.ui.file_import_widget import FileImportWidget
 from volcogui.ui.parameter_widget import ParameterWidget
+from volcogui.ui.postprocess_widget import PostProcessWidget
+from volcogui.ui.region_widget import RegionWidget
+from volcogui.ui.fea_widget import FEAWidget
+from volcogui.ui.watch_folder_widget import WatchFolderWidget
 from volcogui.ui.viewer_widget import ViewerWidget
+from volcogui.ui.slice_widget import SliceViewerWidget
 from volcogui.backend.simulation_runner import SimulationWorker
+from volcogui.backend.refinement import RefinementController
+from volcogui.backend.checkpoint import default_checkpoint_root, find_checkpoint, discard_checkpoint
+from volcogui.backend.fea import fea_result_path
+from volcogui.backend.fea_runner import FEAWorker
+from volcogui.backend.watch_folder import WatchFolderController
+from volcogui.backend.voxel_io import has_voxel_grid
 
 
 class MainWindow(QMainWindow):
@@ -22,7 +35,17 @@ class MainWindow(QMainWindow):
         self.gcode_file = None
         self.output_stl = None
         self.simulation_worker = None
+        self.simulation_params = None
+        self.fea_worker = None
+        self.fea_result = None
         self.progress_dialog = None
+        self.refinement = RefinementController()
+        self.watch_controller = WatchFolderController()
+        
+        # Debounce parameter edits before restarting a refinement run
+        self.restart_timer = QTimer(self)
+        self.restart_timer.setSingleShot(True)
+        self.restart_timer.setInterval(750)
         
         self.setWindowTitle("VolcoGUI - 3D Print Simulator")
         self.setMinimumSize(1200, 800)
@@ -42,13 +65,17 @@ class MainWindow(QMainWindow):
         # Left panel (controls)
         left_panel = self._create_left_panel()
         
-        # Right panel (3D viewer)
+        # Right panel (3D viewer and layer slices)
         self.viewer_widget = ViewerWidget()
+        self.slice_viewer = SliceViewerWidget()
+        self.view_tabs = QTabWidget()
+        self.view_tabs.addTab(self.viewer_widget, "3D View")
+        self.view_tabs.addTab(self.slice_viewer, "Layer Slices")
         
         # Splitter to allow resizing
         splitter = QSplitter(Qt.Orientation.Horizontal)
         splitter.addWidget(left_panel)
-        splitter.addWidget(self.viewer_widget)
+        splitter.addWidget(self.view_tabs)
         splitter.setStretchFactor(0, 1)  # Left panel
         splitter.setStretchFactor(1, 2)  # Right panel gets more space
         
@@ -78,6 +105,14 @@ class MainWindow(QMainWindow):
         self.parameters = ParameterWidget()
         layout.addWidget(self.parameters)
         
+        # Region of interest section
+        self.region = RegionWidget()
+        layout.addWidget(self.region)
+        
+        # Mesh post-processing section
+        self.postprocess = PostProcessWidget()
+        layout.addWidget(self.postprocess)
+        
         # Run button
         self.run_button = QPushButton("Run Simulation")
         self.run_button.setStyleSheet("""
@@ -100,6 +135,14 @@ class MainWindow(QMainWindow):
         self.run_button.setEnabled(False)
         layout.addWidget(self.run_button)
         
+        # Structural analysis of the result
+        self.fea = FEAWidget()
+        layout.addWidget(self.fea)
+        
+        # Automatic simulation of a folder
+        self.watch_folder = WatchFolderWidget()
+        layout.addWidget(self.watch_folder)
+        
         # Spacer
         layout.addStretch()
         
@@ -109,13 +152,31 @@ class MainWindow(QMainWindow):
         info_label.setWordWrap(True)
         layout.addWidget(info_label)
         
-        panel.setMaximumWidth(400)
-        return panel
+        # Scroll the controls when the optional sections don't fit
+        scroll_area = QScrollArea()
+        scroll_area.setWidget(panel)
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        scroll_area.setMaximumWidth(400)
+        return scroll_area
     
     def _connect_signals(self):
         """Connect widget signals to slots."""
         self.file_import.file_selected.connect(self._on_file_selected)
         self.run_button.clicked.connect(self._on_run_simulation)
+        # Any edit that changes the result restarts an active refinement
+        for widget in (self.parameters, self.region, self.postprocess):
+            widget.parameters_changed.connect(self._on_parameters_changed)
+        self.restart_timer.timeout.connect(self._restart_refinement)
+        self.refinement.progress.connect(self.status_bar.showMessage)
+        self.refinement.preview_ready.connect(self._on_preview_ready)
+        self.refinement.refined.connect(self._on_refined)
+        self.refinement.error.connect(self._on_refinement_error)
+        self.fea.run_button.clicked.connect(self._on_run_fea)
+        self.fea.field.currentTextChanged.connect(self._on_fea_field_changed)
+        self.watch_folder.start_button.clicked.connect(self._on_toggle_watch)
+        self.watch_folder.result_selected.connect(self._show_watch_result)
+        self.watch_controller.event.connect(self._on_watch_event)
         
     def _on_file_selected(self, filepath: str):
         """Handle file selection."""
@@ -129,13 +190,30 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "No File", "Please select a G-code file first.")
             return
         
+        # Drop the slice viewer's memory map so the run can clean up the old grid
+        self.slice_viewer.clear()
+        
         # Get parameters
         params = self.parameters.get_parameters()
+        params['region'] = self.region.get_parameters()
+        params['postprocess'] = self.postprocess.get_parameters()
+        
+        if params['progressive_refinement']:
+            # Non-modal: controls stay usable and edits restart the run
+            self.refinement.start(self.gcode_file, params)
+            self.status_bar.showMessage("Running coarse preview...")
+            return
+        self.refinement.stop()
+        
+        if not params['remote_engine']:
+            params['checkpoint_dir'] = str(default_checkpoint_root())
+            params['resume'] = self._ask_resume(params)
+            if params['resume'] is None:
+                return
+        self.simulation_params = params
         
         # Disable controls during simulation
-        self.run_button.setEnabled(False)
-        self.file_import.setEnabled(False)
-        self.parameters.setEnabled(False)
+        self._set_controls_enabled(False)
         
         # Create progress dialog
         self.progress_dialog = QProgressDialog("Initializing...", "Cancel", 0, 0, self)
@@ -152,6 +230,56 @@ class MainWindow(QMainWindow):
         self.simulation_worker.error.connect(self._on_simulation_error)
         self.simulation_worker.start()
         
+    def _ask_resume(self, params: dict):
+        """Offer to resume an interrupted run of the same job.
+        
+        Returns True to resume, False to start over, None to cancel.
+        """
+        state = find_checkpoint(params['checkpoint_dir'], self.gcode_file, params)
+        if state is None:
+            return False
+        reply = QMessageBox.question(
+            self, "Resume Simulation",
+            f"An interrupted run of this G-code with the same parameters was saved "
+            f"after filament {state['filament']}.\n\nResume it? (No starts over)",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            | QMessageBox.StandardButton.Cancel,
+        )
+        if reply == QMessageBox.StandardButton.Cancel:
+            return None
+        if reply == QMessageBox.StandardButton.No:
+            discard_checkpoint(params['checkpoint_dir'], self.gcode_file, params)
+            return False
+        return True
+        
+    def _on_parameters_changed(self):
+        """Restart an active refinement run once edits settle."""
+        if self.refinement.is_active():
+            self.restart_timer.start()
+            
+    def _restart_refinement(self):
+        """Cancel the running pass and start over with the current parameters."""
+        if not self.refinement.is_active() or not self.parameters.progressive_refinement.isChecked():
+            return
+        self.status_bar.showMessage("Parameters changed - restarting refinement...")
+        self._on_run_simulation()
+        
+    def _on_preview_ready(self, stl_path: str):
+        """Show the coarse preview while the fine pass runs."""
+        self.viewer_widget.load_stl(stl_path)
+        self.status_bar.showMessage("Preview ready - refining in background...")
+        
+    def _on_refined(self, stl_path: str):
+        """Replace the preview with the fine result, keeping the camera."""
+        self._set_result(stl_path)
+        self.viewer_widget.load_stl(stl_path, reset_camera=False)
+        self.status_bar.showMessage(f"Refinement complete! Output: {stl_path}")
+        
+    def _on_refinement_error(self, error_message: str):
+        """Handle a failed preview or refinement pass."""
+        QMessageBox.critical(self, "Simulation Error", error_message)
+        self.status_bar.showMessage("Refinement failed")
+        
     def _on_simulation_progress(self, message: str):
         """Handle progress updates from simulation."""
         # DEBUG: Write to file to verify this method is being called
@@ -177,15 +305,101 @@ class MainWindow(QMainWindow):
         if self.progress_dialog:
             self.progress_dialog.close()
             
-        self.output_stl = stl_path
+        self._set_result(stl_path)
         self.viewer_widget.load_stl(stl_path)
         
-        self.status_bar.showMessage(f"Simulation complete! Output: {stl_path}")
+        message = f"Simulation complete! Output: {stl_path}"
+        monitor = self.simulation_worker.monitor if self.simulation_worker else None
+        if monitor is not None and monitor.summary():
+            message += f" ({monitor.summary()})"
+        self.status_bar.showMessage(message)
         
         # Re-enable controls
-        self.run_button.setEnabled(True)
-        self.file_import.setEnabled(True)
-        self.parameters.setEnabled(True)
+        self._set_controls_enabled(True)
+        
+    def _set_result(self, stl_path: str):
+        """Record a new simulation result; FEA and slices need its voxel grid."""
+        self.output_stl = stl_path
+        self.fea_result = None
+        self.fea.summary.setText("")
+        self.fea.run_button.setEnabled(has_voxel_grid(stl_path) and self.fea_worker is None)
+        self.slice_viewer.load_result(stl_path)
+        
+    def _on_run_fea(self):
+        """Run the FEA load case on the current result."""
+        if not self.output_stl:
+            return
+        self.fea.run_button.setEnabled(False)
+        self.fea_worker = FEAWorker(self.output_stl, self.fea.get_parameters())
+        self.fea_worker.progress.connect(self.status_bar.showMessage)
+        self.fea_worker.finished.connect(self._on_fea_finished)
+        self.fea_worker.error.connect(self._on_fea_error)
+        self.fea_worker.start()
+        
+    def _on_fea_finished(self, stats: dict):
+        """Show the FEA fields on the part."""
+        self.fea_worker = None
+        self.fea.run_button.setEnabled(True)
+        if stats['result_path'] != str(fea_result_path(self.output_stl)):
+            # A new simulation result replaced the one that was analysed
+            return
+        self.fea_result = stats['result_path']
+        self.fea.show_summary(stats)
+        self.viewer_widget.load_fea_result(self.fea_result, self.fea.field.currentText())
+        self.status_bar.showMessage(
+            f"FEA complete: {stats['iterations']} iterations, "
+            f"max von Mises {stats['max_von_mises']:.1f} MPa"
+        )
+        
+    def _on_fea_error(self, error_message: str):
+        """Handle a failed FEA run."""
+        self.fea_worker = None
+        self.fea.run_button.setEnabled(has_voxel_grid(self.output_stl))
+        QMessageBox.critical(self, "FEA Error", error_message)
+        self.status_bar.showMessage("FEA failed")
+        
+    def _on_fea_field_changed(self, field: str):
+        """Re-colour the FEA result by another field."""
+        if self.fea_result:
+            self.viewer_widget.load_fea_result(self.fea_result, field)
+        
+    def _on_toggle_watch(self):
+        """Start or stop watching the chosen folder with the current parameters."""
+        if self.watch_controller.is_active():
+            self.watch_controller.stop()
+            self.watch_folder.set_watching(False)
+            self.status_bar.showMessage("Stopped watching folder")
+            return
+        folder = self.watch_folder.folder.text().strip()
+        if not folder or not Path(folder).is_dir():
+            QMessageBox.warning(self, "No Folder", "Please choose an existing folder to watch.")
+            return
+        params = self.parameters.get_parameters()
+        params['region'] = self.region.get_parameters()
+        params['postprocess'] = self.postprocess.get_parameters()
+        # Watched jobs always run in local worker processes
+        for key in ('remote_engine', 'progressive_refinement'):
+            params.pop(key, None)
+        self.watch_controller.start(folder, params, self.watch_folder.workers.value())
+        self.watch_folder.set_watching(True)
+        self.status_bar.showMessage(f"Watching {folder}")
+        
+    def _on_watch_event(self, kind: str, gcode_path: str, message: str):
+        """Show progress of watched jobs."""
+        self.watch_folder.add_event(kind, gcode_path, message)
+        name = Path(gcode_path).name
+        if kind == 'finished':
+            self.status_bar.showMessage(f"Watch folder: simulated {name}")
+        elif kind == 'error':
+            self.status_bar.showMessage(f"Watch folder: {name} failed - {message}")
+        elif kind == 'report_failed':
+            self.status_bar.showMessage(f"Watch folder: report for {name} failed - {message}")
+        
+    def _show_watch_result(self, stl_path: str):
+        """Show a result produced by the watch folder."""
+        self._set_result(stl_path)
+        self.viewer_widget.load_stl(stl_path)
+        self.status_bar.showMessage(f"Showing {stl_path}")
         
     def _on_simulation_error(self, error_message: str):
         """Handle simulation error."""
@@ -196,19 +410,41 @@ class MainWindow(QMainWindow):
         self.status_bar.showMessage("Simulation failed")
         
         # Re-enable controls
-        self.run_button.setEnabled(True)
-        self.file_import.setEnabled(True)
-        self.parameters.setEnabled(True)
+        self._set_controls_enabled(True)
         
     def _cancel_simulation(self):
         """Cancel the running simulation."""
         if self.simulation_worker and self.simulation_worker.isRunning():
+            # Stop the server-side job too when using a remote engine
+            self.simulation_worker.cancel()
             self.simulation_worker.terminate()
             self.simulation_worker.wait()
             
-        self.status_bar.showMessage("Simulation canceled")
+        state = None
+        if self.simulation_params and self.simulation_params.get('checkpoint_dir'):
+            state = find_checkpoint(self.simulation_params['checkpoint_dir'],
+                                    self.gcode_file, self.simulation_params)
+        if state is not None:
+            self.status_bar.showMessage(
+                f"Simulation canceled - saved after filament {state['filament']}, run again to resume"
+            )
+        else:
+            self.status_bar.showMessage("Simulation canceled")
         
         # Re-enable controls
-        self.run_button.setEnabled(True)
-        self.file_import.setEnabled(True)
-        self.parameters.setEnabled(True)
+        self._set_controls_enabled(True)
+        
+    def _set_controls_enabled(self, enabled: bool):
+        """Enable or disable the input controls around a simulation run."""
+        self.run_button.setEnabled(enabled)
+        self.file_import.setEnabled(enabled)
+        self.parameters.setEnabled(enabled)
+        self.region.setEnabled(enabled)
+        self.postprocess.setEnabled(enabled)
+        self.fea.setEnabled(enabled)
+        
+    def closeEvent(self, event):
+        """Stop background refinement passes and folder watching when the window closes."""
+        self.refinement.stop()
+        self.watch_controller.stop()
+        super().closeEvent(event)
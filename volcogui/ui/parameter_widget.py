@@ -2,14 +2,18 @@
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-    QDoubleSpinBox, QGroupBox, QFormLayout
+    QDoubleSpinBox, QGroupBox, QFormLayout, QLineEdit, QCheckBox
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, pyqtSignal
+
+from volcogui.backend.simplify import DEFAULT_TOLERANCE
 
 
 class ParameterWidget(QGroupBox):
     """Widget for configuring simulation parameters."""
     
+    parameters_changed = pyqtSignal()  # Emitted when any parameter is edited
+    
     def __init__(self):
         super().__init__("Simulation Parameters")
         self._setup_ui()
@@ -52,14 +56,129 @@ class ParameterWidget(QGroupBox):
         self.nozzle_diameter.setToolTip("Diameter of the printer nozzle")
         layout.addRow("Nozzle Diameter:", self.nozzle_diameter)
         
+        # G-code simplification
+        self.simplify_gcode = QCheckBox("Merge Collinear Segments")
+        self.simplify_gcode.setToolTip(
+            "Merge runs of short, nearly collinear extrusion moves into single\n"
+            "moves (same extruded volume) and drop zero-length moves before\n"
+            "simulating. Fewer filaments make Volco faster and avoid division\n"
+            "by zero errors on micro-segments."
+        )
+        layout.addRow(self.simplify_gcode)
+        
+        self.simplify_tolerance = QDoubleSpinBox()
+        self.simplify_tolerance.setDecimals(3)
+        self.simplify_tolerance.setRange(0.001, 1.0)
+        self.simplify_tolerance.setSingleStep(0.005)
+        self.simplify_tolerance.setValue(DEFAULT_TOLERANCE)
+        self.simplify_tolerance.setSuffix(" mm")
+        self.simplify_tolerance.setToolTip("How far a merged-away vertex may lie from the merged move")
+        layout.addRow("Merge Tolerance:", self.simplify_tolerance)
+        
+        self.simplify_gcode.toggled.connect(self.simplify_tolerance.setEnabled)
+        self.simplify_tolerance.setEnabled(False)
+        
+        # Acceleration-aware deposition
+        self.consider_acceleration = QCheckBox("Consider Acceleration")
+        self.consider_acceleration.setToolTip(
+            "Distribute material along each filament using trapezoidal\n"
+            "nozzle and extruder speed profiles instead of a flat profile"
+        )
+        layout.addRow(self.consider_acceleration)
+        
+        self.nozzle_jerk_speed = self._speed_input(10.0, 0.0, 100.0, " mm/s",
+                                                   "Maximum instantaneous nozzle speed change")
+        layout.addRow("Nozzle Jerk:", self.nozzle_jerk_speed)
+        self.nozzle_acceleration = self._speed_input(1000.0, 1.0, 100000.0, " mm/s²",
+                                                     "Nozzle acceleration")
+        layout.addRow("Nozzle Acceleration:", self.nozzle_acceleration)
+        self.extruder_jerk_speed = self._speed_input(5.0, 0.0, 100.0, " mm/s",
+                                                     "Maximum instantaneous extruder speed change")
+        layout.addRow("Extruder Jerk:", self.extruder_jerk_speed)
+        self.extruder_acceleration = self._speed_input(5000.0, 1.0, 100000.0, " mm/s²",
+                                                       "Extruder acceleration")
+        layout.addRow("Extruder Acceleration:", self.extruder_acceleration)
+        
+        self.consider_acceleration.toggled.connect(self._update_acceleration_inputs)
+        self._update_acceleration_inputs(False)
+        
+        # Memory budget
+        self.memory_budget = QDoubleSpinBox()
+        self.memory_budget.setDecimals(1)
+        self.memory_budget.setRange(0.0, 1024.0)
+        self.memory_budget.setSingleStep(1.0)
+        self.memory_budget.setValue(0.0)
+        self.memory_budget.setSuffix(" GB")
+        self.memory_budget.setSpecialValueText("Unlimited")
+        self.memory_budget.setToolTip(
+            "Stop the simulation if it would use more memory than this.\n"
+            "With a budget, local simulations run in a separate process\n"
+            "so stopping them cannot take down the GUI."
+        )
+        layout.addRow("Memory Budget:", self.memory_budget)
+        
+        # Progressive refinement
+        self.progressive_refinement = QCheckBox("Coarse Preview First")
+        self.progressive_refinement.setToolTip(
+            "Show a quick low-resolution preview, then refine in the background.\n"
+            "Changing parameters while refining restarts the run."
+        )
+        layout.addRow(self.progressive_refinement)
+        
+        # Remote engine
+        self.remote_engine = QLineEdit()
+        self.remote_engine.setPlaceholderText("Local (e.g. 192.168.1.20:8765)")
+        self.remote_engine.setToolTip(
+            "Address of a volcogui-server to run the simulation on\n"
+            "Leave empty to simulate on this computer"
+        )
+        layout.addRow("Remote Engine:", self.remote_engine)
+        
         self.setLayout(layout)
         
+        for spin_box in (self.voxel_size, self.step_size, self.nozzle_diameter,
+                         self.simplify_tolerance, self.nozzle_jerk_speed, self.nozzle_acceleration,
+                         self.extruder_jerk_speed, self.extruder_acceleration):
+            spin_box.valueChanged.connect(self.parameters_changed)
+        self.memory_budget.valueChanged.connect(self.parameters_changed)
+        self.simplify_gcode.toggled.connect(self.parameters_changed)
+        self.consider_acceleration.toggled.connect(self.parameters_changed)
+        self.remote_engine.textChanged.connect(self.parameters_changed)
+        
+    def _speed_input(self, value: float, minimum: float, maximum: float,
+                     suffix: str, tooltip: str) -> QDoubleSpinBox:
+        """Create a spin box for a jerk or acceleration value."""
+        spin_box = QDoubleSpinBox()
+        spin_box.setDecimals(1)
+        spin_box.setRange(minimum, maximum)
+        spin_box.setSingleStep(maximum / 100.0)
+        spin_box.setValue(value)
+        spin_box.setSuffix(suffix)
+        spin_box.setToolTip(tooltip)
+        return spin_box
+        
+    def _update_acceleration_inputs(self, enabled: bool):
+        """Only allow editing jerk/acceleration when acceleration is considered."""
+        for spin_box in (self.nozzle_jerk_speed, self.nozzle_acceleration,
+                         self.extruder_jerk_speed, self.extruder_acceleration):
+            spin_box.setEnabled(enabled)
+        
     def get_parameters(self) -> dict:
         """Get current parameter values as a dictionary."""
         return {
             'voxel_size': self.voxel_size.value(),
             'step_size': self.step_size.value(),
-            'nozzle_diameter': self.nozzle_diameter.value()
+            'nozzle_diameter': self.nozzle_diameter.value(),
+            'simplify_gcode': self.simplify_gcode.isChecked(),
+            'simplify_tolerance': self.simplify_tolerance.value(),
+            'consider_acceleration': self.consider_acceleration.isChecked(),
+            'nozzle_jerk_speed': self.nozzle_jerk_speed.value(),
+            'nozzle_acceleration': self.nozzle_acceleration.value(),
+            'extruder_jerk_speed': self.extruder_jerk_speed.value(),
+            'extruder_acceleration': self.extruder_acceleration.value(),
+            'memory_budget_gb': self.memory_budget.value(),
+            'progressive_refinement': self.progressive_refinement.isChecked(),
+            'remote_engine': self.remote_engine.text().strip(),
         }
     
     def set_parameters(self, params: dict):
@@ -70,3 +189,19 @@ class ParameterWidget(QGroupBox):
             self.step_size.setValue(params['step_size'])
         if 'nozzle_diameter' in params:
             self.nozzle_diameter.setValue(params['nozzle_diameter'])
+        if 'simplify_gcode' in params:
+            self.simplify_gcode.setChecked(params['simplify_gcode'])
+        if 'simplify_tolerance' in params:
+            self.simplify_tolerance.setValue(params['simplify_tolerance'])
+        if 'consider_acceleration' in params:
+            self.consider_acceleration.setChecked(params['consider_acceleration'])
+        for key in ('nozzle_jerk_speed', 'nozzle_acceleration',
+                    'extruder_jerk_speed', 'extruder_acceleration'):
+            if key in params:
+                getattr(self, key).setValue(params[key])
+        if 'memory_budget_gb' in params:
+            self.memory_budget.setValue(params['memory_budget_gb'])
+        if 'progressive_refinement' in params:
+            self.progressive_refinement.setChecked(params['progressive_refinement'])
+        if 'remote_engine' in params:
+            self.remote_engine.setText(params['remote_engine'])
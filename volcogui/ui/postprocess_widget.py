@@ -0,0 +1,93 @@
+"""Mesh post-processing settings widget."""
+
+from PyQt6.QtWidgets import (
+    QDoubleSpinBox, QSpinBox, QGroupBox, QFormLayout
+)
+from PyQt6.QtCore import pyqtSignal
+
+
+class PostProcessWidget(QGroupBox):
+    """Widget for configuring weld/smooth/decimate applied to the result mesh."""
+
+    parameters_changed = pyqtSignal()  # Emitted when post-processing is toggled or edited
+
+    def __init__(self):
+        super().__init__("Mesh Post-processing")
+        self.setCheckable(True)
+        self.setChecked(False)
+        self._setup_ui()
+
+    def _setup_ui(self):
+        """Set up the user interface."""
+        layout = QFormLayout()
+        layout.setSpacing(10)
+
+        # Weld tolerance
+        self.weld_tolerance = QDoubleSpinBox()
+        self.weld_tolerance.setDecimals(4)
+        self.weld_tolerance.setRange(0.0, 1.0)
+        self.weld_tolerance.setSingleStep(0.001)
+        self.weld_tolerance.setValue(0.0)
+        self.weld_tolerance.setSuffix(" mm")
+        self.weld_tolerance.setToolTip("Merge vertices closer than this distance (0 = identical only)")
+        layout.addRow("Weld Tolerance:", self.weld_tolerance)
+
+        # Taubin smoothing
+        self.smooth_iterations = QSpinBox()
+        self.smooth_iterations.setRange(0, 200)
+        self.smooth_iterations.setValue(10)
+        self.smooth_iterations.setToolTip(
+            "Taubin smoothing passes to remove voxel stair-steps (0 = off)\n"
+            "Taubin smoothing does not shrink the part like plain Laplacian smoothing"
+        )
+        layout.addRow("Smoothing Iterations:", self.smooth_iterations)
+
+        # Decimation target
+        self.target_triangles = QSpinBox()
+        self.target_triangles.setRange(0, 100_000_000)
+        self.target_triangles.setSingleStep(10000)
+        self.target_triangles.setValue(0)
+        self.target_triangles.setSpecialValueText("No limit")
+        self.target_triangles.setToolTip("Quadric decimation target triangle count (0 = no limit)")
+        layout.addRow("Target Triangles:", self.target_triangles)
+
+        # Decimation error bound
+        self.max_error = QDoubleSpinBox()
+        self.max_error.setDecimals(3)
+        self.max_error.setRange(0.0, 1.0)
+        self.max_error.setSingleStep(0.005)
+        self.max_error.setValue(0.0)
+        self.max_error.setSuffix(" mm")
+        self.max_error.setSpecialValueText("No limit")
+        self.max_error.setToolTip("Stop decimating once surface deviation reaches this distance")
+        layout.addRow("Max Decimation Error:", self.max_error)
+
+        self.setLayout(layout)
+
+        for spin_box in (self.weld_tolerance, self.smooth_iterations,
+                         self.target_triangles, self.max_error):
+            spin_box.valueChanged.connect(self.parameters_changed)
+        self.toggled.connect(self.parameters_changed)
+
+    def get_parameters(self) -> dict:
+        """Get current post-processing settings as a dictionary."""
+        return {
+            'enabled': self.isChecked(),
+            'weld_tolerance': self.weld_tolerance.value(),
+            'smooth_iterations': self.smooth_iterations.value(),
+            'target_triangles': self.target_triangles.value(),
+            'max_error': self.max_error.value(),
+        }
+
+    def set_parameters(self, params: dict):
+        """Set post-processing settings from a dictionary."""
+        if 'enabled' in params:
+            self.setChecked(params['enabled'])
+        if 'weld_tolerance' in params:
+            self.weld_tolerance.setValue(params['weld_tolerance'])
+        if 'smooth_iterations' in params:
+            self.smooth_iterations.setValue(params['smooth_iterations'])
+        if 'target_triangles' in params:
+            self.target_triangles.setValue(params['target_triangles'])
+        if 'max_error' in params:
+            self.max_error.setValue(params['max_error'])
@@ -0,0 +1,97 @@
+"""Region-of-interest settings widget."""
+
+from PyQt6.QtWidgets import (
+    QWidget, QHBoxLayout, QDoubleSpinBox, QGroupBox, QFormLayout
+)
+from PyQt6.QtCore import pyqtSignal
+
+
+# Spin boxes at their minimum show "Any", meaning the bound is not set
+UNBOUNDED = -10000.0
+
+
+class RegionWidget(QGroupBox):
+    """Widget for restricting the simulation to a Z range and/or XY window."""
+
+    parameters_changed = pyqtSignal()  # Emitted when the region is toggled or edited
+
+    def __init__(self):
+        super().__init__("Region of Interest")
+        self.setCheckable(True)
+        self.setChecked(False)
+        self._setup_ui()
+
+    def _setup_ui(self):
+        """Set up the user interface."""
+        layout = QFormLayout()
+        layout.setSpacing(10)
+
+        self.bounds = {}
+        for axis in 'xyz':
+            low = self._bound_input(f"Lowest {axis.upper()} to simulate")
+            high = self._bound_input(f"Highest {axis.upper()} to simulate")
+            row = QWidget()
+            row_layout = QHBoxLayout(row)
+            row_layout.setContentsMargins(0, 0, 0, 0)
+            row_layout.addWidget(low)
+            row_layout.addWidget(high)
+            layout.addRow(f"{axis.upper()} Range:", row)
+            self.bounds[axis] = (low, high)
+
+        # Halo around the window
+        self.halo = QDoubleSpinBox()
+        self.halo.setDecimals(2)
+        self.halo.setRange(0.0, 50.0)
+        self.halo.setSingleStep(0.1)
+        self.halo.setValue(1.0)
+        self.halo.setSuffix(" mm")
+        self.halo.setToolTip(
+            "Extra margin simulated around the region so beads that\n"
+            "spread into it from outside are still deposited"
+        )
+        layout.addRow("Halo:", self.halo)
+
+        self.setLayout(layout)
+
+        for low, high in self.bounds.values():
+            low.valueChanged.connect(self.parameters_changed)
+            high.valueChanged.connect(self.parameters_changed)
+        self.halo.valueChanged.connect(self.parameters_changed)
+        self.toggled.connect(self.parameters_changed)
+
+    def _bound_input(self, tooltip: str) -> QDoubleSpinBox:
+        """Create a spin box for one region bound."""
+        spin_box = QDoubleSpinBox()
+        spin_box.setDecimals(2)
+        spin_box.setRange(UNBOUNDED, 10000.0)
+        spin_box.setSingleStep(1.0)
+        spin_box.setValue(UNBOUNDED)
+        spin_box.setSuffix(" mm")
+        spin_box.setSpecialValueText("Any")
+        spin_box.setToolTip(tooltip)
+        return spin_box
+
+    def get_parameters(self):
+        """Get the region as {'x': (low, high), ..., 'halo': mm}, or None if disabled.
+
+        Unset bounds are None; axes with no bounds at all are None.
+        """
+        if not self.isChecked():
+            return None
+        region = {'halo': self.halo.value()}
+        for axis, (low, high) in self.bounds.items():
+            limits = tuple(None if box.value() == UNBOUNDED else box.value() for box in (low, high))
+            region[axis] = None if limits == (None, None) else limits
+        return region
+
+    def set_parameters(self, region):
+        """Set the region from a dictionary as returned by get_parameters."""
+        self.setChecked(region is not None)
+        if region is None:
+            return
+        if 'halo' in region:
+            self.halo.setValue(region['halo'])
+        for axis, (low, high) in self.bounds.items():
+            limits = region.get(axis) or (None, None)
+            low.setValue(UNBOUNDED if limits[0] is None else limits[0])
+            high.setValue(UNBOUNDED if limits[1] is None else limits[1])
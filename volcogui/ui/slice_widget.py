@@ -0,0 +1,132 @@
+"""2D layer cross-section viewer for retained voxel grids."""
+
+from collections import OrderedDict
+
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QSlider, QSizePolicy
+)
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QImage, QPixmap
+
+from volcogui.backend.voxel_io import load_voxel_grid
+from volcogui.backend.slices import AXES, slice_count, slice_plane, plane_rgba, fill_fraction
+
+
+AXIS_LABELS = {'z': "Z (layers)", 'y': "Y", 'x': "X"}
+
+# Rendered slices kept for scrubbing back and forth
+CACHE_SIZE = 64
+
+
+class SliceViewerWidget(QWidget):
+    """Shows one Z, Y or X plane of the current result's voxel grid."""
+
+    def __init__(self):
+        super().__init__()
+        self.grid = None
+        self.voxel_size = None
+        self._cache = OrderedDict()
+        self._pixmap = None
+        self._setup_ui()
+
+    def _setup_ui(self):
+        """Set up the user interface."""
+        layout = QVBoxLayout(self)
+
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Axis:"))
+        self.axis = QComboBox()
+        for axis in AXES:
+            self.axis.addItem(AXIS_LABELS[axis], axis)
+        self.axis.setToolTip("Plane to cut: Z shows one printed layer from above")
+        controls.addWidget(self.axis)
+
+        self.slider = QSlider(Qt.Orientation.Horizontal)
+        self.slider.setToolTip("Scrub through the slices")
+        controls.addWidget(self.slider, stretch=1)
+        layout.addLayout(controls)
+
+        self.image = QLabel()
+        self.image.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.image.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Ignored)
+        self.image.setStyleSheet("background-color: #202028;")
+        layout.addWidget(self.image, stretch=1)
+
+        self.info = QLabel("")
+        self.info.setStyleSheet("color: #666; font-size: 11px;")
+        layout.addWidget(self.info)
+
+        self.axis.currentIndexChanged.connect(self._on_axis_changed)
+        self.slider.valueChanged.connect(self._render)
+        self.clear()
+
+    def clear(self, message: str = "Run a simulation to see its layer slices"):
+        """Drop the current grid and show a message instead."""
+        self.grid = None
+        self._cache.clear()
+        self._pixmap = None
+        self.image.clear()
+        self.image.setText(message)
+        self.info.setText("")
+        self.slider.setEnabled(False)
+        self.axis.setEnabled(False)
+
+    def load_result(self, stl_path: str):
+        """Memory-map the voxel grid of a result; only viewed slices are read."""
+        loaded = load_voxel_grid(stl_path, mmap=True)
+        if loaded is None:
+            self.clear("This result has no saved voxel grid")
+            return
+        self.clear()
+        self.grid, self.voxel_size = loaded
+        self.slider.setEnabled(True)
+        self.axis.setEnabled(True)
+        self._on_axis_changed()
+
+    def _on_axis_changed(self):
+        if self.grid is None:
+            return
+        count = slice_count(self.grid.shape, self.axis.currentData())
+        self.slider.blockSignals(True)
+        self.slider.setRange(0, count - 1)
+        self.slider.setValue(count // 2)
+        self.slider.blockSignals(False)
+        self._render()
+
+    def _render(self):
+        """Show the slice under the slider."""
+        if self.grid is None:
+            return
+        axis, index = self.axis.currentData(), self.slider.value()
+        key = (axis, index)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+        else:
+            plane = slice_plane(self.grid, axis, index)
+            rgba = plane_rgba(plane)
+            height, width = rgba.shape[:2]
+            image = QImage(rgba.data, width, height, 4 * width, QImage.Format.Format_RGBA8888)
+            # copy(): the image must not outlive the NumPy buffer
+            self._cache[key] = (QPixmap.fromImage(image.copy()), fill_fraction(plane))
+            if len(self._cache) > CACHE_SIZE:
+                self._cache.popitem(last=False)
+        self._pixmap, filled = self._cache[key]
+        self._show_pixmap()
+        count = self.slider.maximum() + 1
+        self.info.setText(
+            f"{axis.upper()} = {index * self.voxel_size:.2f} mm (slice {index + 1} of {count}), "
+            f"{filled:.0%} material"
+        )
+
+    def _show_pixmap(self):
+        if self._pixmap is None:
+            return
+        # Nearest-neighbour scaling keeps voxels crisp
+        self.image.setPixmap(self._pixmap.scaled(
+            self.image.size(), Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.FastTransformation,
+        ))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._show_pixmap()
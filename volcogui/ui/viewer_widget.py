@@ -7,6 +7,7 @@ from PyQt6.QtCore import Qt
 try:
     from pyvistaqt import QtInteractor
     import pyvista as pv
+    from volcogui.backend.scene import read_result_mesh, show_result_mesh
     PYVISTA_AVAILABLE = True
 except ImportError:
     PYVISTA_AVAILABLE = False
@@ -57,8 +58,12 @@ class ViewerWidget(QWidget):
             viewport=True
         )
         
-    def load_stl(self, stl_path: str):
-        """Load and display an STL file."""
+    def load_stl(self, stl_path: str, reset_camera: bool = True):
+        """Load and display an STL file.
+        
+        reset_camera=False keeps the current view, e.g. when a refined
+        result replaces a preview of the same part.
+        """
         if not PYVISTA_AVAILABLE:
             return
             
@@ -67,27 +72,42 @@ class ViewerWidget(QWidget):
             self.plotter.clear()
             
             # Load mesh
-            mesh = pv.read(stl_path)
+            mesh = read_result_mesh(stl_path)
+            self.current_mesh = mesh
+            
+            # Same scene as the offscreen thumbnails (see backend/scene.py)
+            show_result_mesh(self.plotter, mesh, reset_camera)
+            
+        except Exception as e:
+            print(f"Error loading STL: {e}")
+            self._show_placeholder()
+            
+    def load_fea_result(self, result_path: str, field: str, reset_camera: bool = False):
+        """Display an FEA result surface coloured by one of its fields."""
+        if not PYVISTA_AVAILABLE:
+            return
+            
+        try:
+            self.plotter.clear()
+            mesh = pv.read(result_path)
             self.current_mesh = mesh
             
-            # Add mesh to plotter
             self.plotter.add_mesh(
                 mesh,
-                color='lightblue',
-                show_edges=True,
-                edge_color='gray',
-                opacity=0.9
+                scalars=field,
+                cmap='jet',
+                show_edges=False,
+                scalar_bar_args={'title': field},
             )
             
-            # Reset camera
-            self.plotter.reset_camera()
-            self.plotter.view_isometric()
+            if reset_camera:
+                self.plotter.reset_camera()
+                self.plotter.view_isometric()
             
-            # Add axes
             self.plotter.show_axes()
             
         except Exception as e:
-            print(f"Error loading STL: {e}")
+            print(f"Error loading FEA result: {e}")
             self._show_placeholder()
             
     def clear(self):
@@ -0,0 +1,155 @@
+"""Watch folder widget for automatic simulation of incoming G-code."""
+
+import os
+from pathlib import Path
+
+from PyQt6.QtWidgets import (
+    QGroupBox, QFormLayout, QHBoxLayout, QLineEdit, QPushButton, QSpinBox,
+    QListWidget, QListWidgetItem, QLabel, QFileDialog
+)
+from PyQt6.QtCore import Qt, QSize, QUrl, pyqtSignal
+from PyQt6.QtGui import QIcon, QDesktopServices
+
+from volcogui.backend.report import CONTACT_SHEET, thumbnail_path
+from volcogui.backend.watch_folder import PARAMS_FILE, result_path
+
+
+# Finished or failed jobs listed at most
+MAX_ITEMS = 100
+
+# Item data holding the job's G-code path, to attach its thumbnail later
+GCODE_ROLE = Qt.ItemDataRole.UserRole + 1
+
+
+class WatchFolderWidget(QGroupBox):
+    """Widget for watching a folder and listing the results it produces."""
+
+    result_selected = pyqtSignal(str)  # Result STL chosen from the list
+
+    def __init__(self):
+        super().__init__("Watch Folder")
+        self.running = 0
+        self.queued = 0
+        self._setup_ui()
+
+    def _setup_ui(self):
+        """Set up the user interface."""
+        layout = QFormLayout()
+        layout.setSpacing(10)
+
+        row = QHBoxLayout()
+        self.folder = QLineEdit()
+        self.folder.setPlaceholderText("Folder to watch for .gcode files")
+        self.folder.setToolTip(
+            "New or changed .gcode files in this folder are simulated with the\n"
+            f"current parameters ({PARAMS_FILE} in the folder overrides them).\n"
+            "Results are saved next to each file as <name>.volco.stl"
+        )
+        row.addWidget(self.folder)
+        browse_button = QPushButton("Browse...")
+        browse_button.clicked.connect(self._browse_folder)
+        row.addWidget(browse_button)
+        layout.addRow(row)
+
+        self.workers = QSpinBox()
+        self.workers.setRange(1, os.cpu_count() or 1)
+        self.workers.setValue(1)
+        self.workers.setToolTip("Simulations to run at once (each uses its own process)")
+        layout.addRow("Workers:", self.workers)
+
+        self.start_button = QPushButton("Start Watching")
+        self.sheet_button = QPushButton("Open Contact Sheet")
+        self.sheet_button.setToolTip(f"Open {CONTACT_SHEET}: thumbnails and reports of all results")
+        self.sheet_button.clicked.connect(self._open_contact_sheet)
+        row = QHBoxLayout()
+        row.addWidget(self.start_button)
+        row.addWidget(self.sheet_button)
+        layout.addRow(row)
+
+        self.status = QLabel("")
+        self.status.setStyleSheet("color: #666; font-size: 11px;")
+        layout.addRow(self.status)
+
+        self.results = QListWidget()
+        self.results.setIconSize(QSize(64, 48))
+        self.results.setMaximumHeight(180)
+        self.results.setToolTip("Double-click a result to show it")
+        self.results.itemDoubleClicked.connect(self._on_item_double_clicked)
+        layout.addRow(self.results)
+
+        self.setLayout(layout)
+
+    def _browse_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "Select Folder to Watch", self.folder.text())
+        if folder:
+            self.folder.setText(folder)
+
+    def _open_contact_sheet(self):
+        sheet = Path(self.folder.text().strip()) / CONTACT_SHEET
+        if sheet.exists():
+            QDesktopServices.openUrl(QUrl.fromLocalFile(str(sheet)))
+        else:
+            self.status.setText("No reports yet in this folder")
+
+    def set_watching(self, watching: bool):
+        """Update the controls for a started or stopped watcher."""
+        self.start_button.setText("Stop Watching" if watching else "Start Watching")
+        self.folder.setEnabled(not watching)
+        self.workers.setEnabled(not watching)
+        self.running = self.queued = 0
+        self.status.setText("Waiting for G-code..." if watching else "")
+
+    def add_event(self, kind: str, gcode_path: str, message: str):
+        """Show a watcher event."""
+        name = Path(gcode_path).name
+        if kind == 'queued':
+            self.queued += 1
+        elif kind == 'started':
+            self.queued -= 1
+            self.running += 1
+        elif kind in ('finished', 'error') and gcode_path.endswith('.gcode'):
+            # Errors can also be about a folder's parameter file
+            self.running -= 1
+
+        if kind == 'report':
+            self._set_thumbnail(gcode_path)
+            return
+
+        if kind == 'finished':
+            item = QListWidgetItem(f"✓ {name}")
+            item.setData(Qt.ItemDataRole.UserRole, message)
+            item.setToolTip(message)
+        elif kind == 'error':
+            item = QListWidgetItem(f"✗ {name}")
+            item.setToolTip(message)
+        elif kind == 'skipped':
+            item = QListWidgetItem(f"– {name} ({message})")
+            item.setData(Qt.ItemDataRole.UserRole, str(result_path(Path(gcode_path))))
+        else:
+            item = None
+        if item is not None:
+            item.setData(GCODE_ROLE, gcode_path)
+            self.results.insertItem(0, item)
+            if kind == 'skipped':
+                # Reports rendered in an earlier session
+                self._set_thumbnail(gcode_path)
+            while self.results.count() > MAX_ITEMS:
+                self.results.takeItem(self.results.count() - 1)
+
+        self.status.setText(f"{self.running} running, {self.queued} queued")
+
+    def _set_thumbnail(self, gcode_path: str):
+        """Show the result's offscreen thumbnail on its list entries."""
+        thumbnail = thumbnail_path(result_path(Path(gcode_path)))
+        if not thumbnail.exists():
+            return
+        icon = QIcon(str(thumbnail))
+        for row in range(self.results.count()):
+            item = self.results.item(row)
+            if item.data(GCODE_ROLE) == gcode_path and item.data(Qt.ItemDataRole.UserRole):
+                item.setIcon(icon)
+
+    def _on_item_double_clicked(self, item: QListWidgetItem):
+        stl_path = item.data(Qt.ItemDataRole.UserRole)
+        if stl_path and Path(stl_path).exists():
+            self.result_selected.emit(stl_path)